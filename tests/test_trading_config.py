@@ -0,0 +1,43 @@
+import copy
+import dataclasses
+import pickle
+
+import pytest
+
+from trading.trading_config import TradingConfig
+
+
+def _shared(**kwargs):
+    TradingConfig.get.cache_clear()
+    return TradingConfig.get("alpaca", "key", "secret", **kwargs)
+
+
+def test_get_returns_shared_read_only_instance():
+    cfg = _shared()
+    assert cfg is TradingConfig.get("alpaca", "key", "secret")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        cfg.trade_mode = "real"
+
+
+def test_get_equals_directly_built_config():
+    shared = _shared(trade_mode="paper")
+    built = TradingConfig("alpaca", "key", "secret", trade_mode="paper")
+    assert shared == built
+    assert built == shared
+    assert shared != TradingConfig("alpaca", "key", "secret", trade_mode="real")
+
+
+def test_replace_on_shared_config():
+    shared = _shared()
+    other = dataclasses.replace(shared, api_key="other")
+    assert other.api_key == "other"
+    assert shared.api_key == "key"
+    assert dataclasses.replace(shared) == shared
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        other.api_key = "again"
+
+
+def test_shared_config_copies_and_pickles():
+    shared = _shared()
+    for clone in (copy.copy(shared), copy.deepcopy(shared), pickle.loads(pickle.dumps(shared))):
+        assert clone == shared
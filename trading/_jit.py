@@ -0,0 +1,24 @@
+# Optional Numba support for the trading hot paths.
+# Kernels decorated with ``njit`` are compiled when Numba is installed; callers
+# check ``HAVE_NUMBA`` and keep a plain NumPy path for environments without it.
+from __future__ import annotations
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+HAVE_NUMBA = numba is not None
+
+if HAVE_NUMBA:
+    njit = numba.njit
+    prange = numba.prange
+else:
+    def njit(*args, **kwargs):
+        """No-op stand-in for ``numba.njit`` (bare and parametrized forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+    prange = range
+
@@ -113,6 +113,16 @@ WORLD_ASSET_MAP = {
     # more..
 }
 
+def _pack_symbol_type(country_id: int, exchange_id: int, asset_type_id: int) -> int:
+    """Pack a (country, exchange, asset type) ID triple into one int: 10|7|5 bits."""
+    return (country_id << 12) | (exchange_id << 5) | asset_type_id
+
+# WORLD_ASSET_MAP keyed by the packed int, so SYMBOL_ID hashes one int instead of a tuple.
+_PACKED_ASSET_MAP = {_pack_symbol_type(*key): submap for key, submap in WORLD_ASSET_MAP.items()}
+_NO_SYMBOLS: dict = {}
+
 def SYMBOL_ID(country_code: str, exchange_code: str, asset_code: str, symbol_code: str) -> int | None:
     """Return the local symbol ID for the specified asset components."""
-    return WORLD_ASSET_MAP.get(SYMBOL_TYPE(country_code, exchange_code, asset_code), {}).get(symbol_code)
+    country_id = COUNTRY_MAP[country_code]
+    key = _pack_symbol_type(country_id, EXCHANGE_MAP[country_id][exchange_code], ASSET_TYPE_MAP[asset_code])
+    return _PACKED_ASSET_MAP.get(key, _NO_SYMBOLS).get(symbol_code)
@@ -1,7 +1,62 @@
 # Local account portfolio manager used for simulated trading.
 from __future__ import annotations
 import numpy as np
-from typing import Iterable, Dict, Any
+from typing import Iterable, Dict, Any, NamedTuple, Union
+
+from ._jit import HAVE_NUMBA, njit, prange
+
+
+class AccountSoA(NamedTuple):
+    """Per-lane account state arrays in ACCOUNT_FEATURE_KEYS order (views, not copies)."""
+    position_qty: np.ndarray
+    cash: np.ndarray
+    avg_entry_price: np.ndarray
+    unrealized_pnl: np.ndarray
+    exposure: np.ndarray
+    asset_nav: np.ndarray
+
+
+class OrderResultSoA(NamedTuple):
+    """Per-lane local fills as returned by ``TradingMarket.submit_orders`` in local mode."""
+    filled_avg_price: np.ndarray  # float32 (N,); 0.0 for skipped lanes
+    action: np.ndarray            # int8 (N,); 0=hold, 1=buy, 2=sell
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _apply_actions_kernel(actions, prices, cash, qty, avg_px, prev_nav, exposure, upnl, asset_nav, reward_out):
+    """Single-pass, per-lane version of :meth:`LocalAccount.apply_actions`."""
+    for i in range(actions.shape[0]):
+        a = actions[i]
+        p = prices[i]
+        q = qty[i]
+        if a == 1:
+            avg_px[i] = (avg_px[i] * q + p) / (q + 1)
+            cash[i] -= p
+            q += 1
+        elif a == 2 and q >= 1:
+            cash[i] += p
+            q -= 1
+        qty[i] = q
+        if q == 0:
+            avg_px[i] = 0.0
+        exposure[i] = q * p
+        upnl[i] = (p - avg_px[i]) * q
+        nav = cash[i] + exposure[i]
+        asset_nav[i] = nav
+        reward_out[i] = nav - prev_nav[i]
+        prev_nav[i] = nav
+
+@njit(parallel=True, cache=True)
+def _fill_account_features(out, qty, cash, avg_px, upnl, exposure, asset_nav):
+    """Write the six account columns of ``out`` in one row-wise pass."""
+    for i in prange(out.shape[0]):
+        out[i, 0] = qty[i]
+        out[i, 1] = cash[i]
+        out[i, 2] = avg_px[i]
+        out[i, 3] = upnl[i]
+        out[i, 4] = exposure[i]
+        out[i, 5] = asset_nav[i]
+
 
 class LocalAccount:
     """
@@ -11,6 +66,9 @@ class LocalAccount:
     The trading environment merely reads this state and routes orders to the
     appropriate slot.
     """
+    # Reset-time random draws are taken from pools of this many values per field
+    RAND_POOL_SIZE = 8192
+
     def __init__(
         self,
         num_envs: int,
@@ -18,7 +76,7 @@ class LocalAccount:
         budget_range=(100.0, 10_000.0),
         max_step_range=(1_000, 10_000),
     ):
-        self.rng: np.random.Generator = np.random.default_rng()
+        self._rng: np.random.Generator = np.random.default_rng()
         self.num_envs = int(num_envs)
 
         # Configuration ranges
@@ -31,16 +89,23 @@ class LocalAccount:
 
 
         # State arrays; each index corresponds to the same symbol across arrays
-        self.cash = np.zeros(self.num_envs, dtype=np.float64)
-        self.position_qty = np.zeros(self.num_envs, dtype=np.int64)
-        self.avg_entry_price = np.zeros(self.num_envs, dtype=np.float64)
-        self.prev_nav = np.zeros(self.num_envs, dtype=np.float64)
-        self.max_steps = np.zeros(self.num_envs, dtype=np.int64)
+        self.cash = np.zeros(self.num_envs, dtype=np.float32)
+        self.position_qty = np.zeros(self.num_envs, dtype=np.int32)
+        self.avg_entry_price = np.zeros(self.num_envs, dtype=np.float32)
+        self.prev_nav = np.zeros(self.num_envs, dtype=np.float32)
+        self.max_steps = np.zeros(self.num_envs, dtype=np.int32)
 
         # Derived state variables
-        self.unrealized_pnl = np.zeros(self.num_envs, dtype=np.float64)
-        self.exposure = np.zeros(self.num_envs, dtype=np.float64)
-        self.asset_nav = np.zeros(self.num_envs, dtype=np.float64)
+        self.unrealized_pnl = np.zeros(self.num_envs, dtype=np.float32)
+        self.exposure = np.zeros(self.num_envs, dtype=np.float32)
+        self.asset_nav = np.zeros(self.num_envs, dtype=np.float32)
+
+        # Feature-ordered view over the arrays above; they are only ever updated
+        # in place, so the tuple is built once and stays valid
+        self._account_soa = AccountSoA(
+            self.position_qty, self.cash, self.avg_entry_price,
+            self.unrealized_pnl, self.exposure, self.asset_nav,
+        )
 
         # ---- Initialize cash and NAV for local simulation ----
         # Seed each environment’s cash within the budget range so the first trade
@@ -53,26 +118,70 @@ class LocalAccount:
         self.prev_nav[:] = self.cash
         self.asset_nav[:] = self.prev_nav  # per-slot NAV = cash at start
 
+        # Scratch buffers reused by ``apply_actions`` so a step does not allocate
+        self._buf_delta = np.zeros(self.num_envs, dtype=np.int8)
+        self._buf_buy = np.zeros(self.num_envs, dtype=bool)
+        self._buf_sell = np.zeros(self.num_envs, dtype=bool)
+        self._buf_mask = np.zeros(self.num_envs, dtype=bool)
+        self._buf_f32 = np.zeros(self.num_envs, dtype=np.float32)
+        self._buf_denom = np.zeros(self.num_envs, dtype=np.float32)
+        self._buf_reward = np.zeros(self.num_envs, dtype=np.float32)
+        self._buf_truncated = np.zeros(self.num_envs, dtype=bool)
+        self._buf_terminated = np.zeros(self.num_envs, dtype=bool)
+
+        # Pools of reset draws (cash, qty, max_steps); filled on first use, and
+        # dropped whenever ``rng`` is reassigned (see the property below)
+        self._rand_pool_size = max(self.RAND_POOL_SIZE, self.num_envs)
+        self._rand_cash_pool = self._rand_qty_pool = self._rand_steps_pool = None
+        self._rand_cursor = self._rand_pool_size
+
+        # Compile the kernels up front so the first step pays no JIT latency
+        if HAVE_NUMBA:
+            f, q = np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.int32)
+            _apply_actions_kernel(np.zeros(0, dtype=np.int8), f, f, q, f, f, f, f, f, f)
+            _fill_account_features(np.zeros((0, 6), dtype=np.float32), q, f, f, f, f, f)
+
+
+    @property
+    def rng(self) -> np.random.Generator:
+        """Generator behind reset draws and symbol choice."""
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng: np.random.Generator) -> None:
+        # Discard pooled draws from the old generator so a reseed takes effect at
+        # the next reset. State changed in place on the same generator is not seen
+        # until the pools next refill.
+        self._rng = rng
+        self._rand_cursor = self._rand_pool_size
 
     # ---- Snapshot helpers used by TradingVecEnv ----
+    def features_soa(self) -> AccountSoA:
+        """
+        Return the live state arrays as an :class:`AccountSoA` without copying.
+        The arrays are updated in place by later steps and resets.
+        """
+        return self._account_soa
+
     def get_account_features(self, symbols) -> np.ndarray:
         """
         Return (N,6) float32 array aligned with `symbols`.
         Columns match TradingVecEnv.ACCOUNT_FEATURE_KEYS order:
         [position_qty, cash, avg_entry_price, unrealized_pnl, exposure, asset_nav]
         """
-        import numpy as np
         # Ensure 1D unique order is NOT forced here; keep exact lane order
         n = len(symbols)
-        out = np.zeros((n, 6), dtype=np.float32)
-
-        # Vectorized fill
-        out[:, 0] = self.position_qty[:n]
-        out[:, 1] = self.cash[:n]
-        out[:, 2] = self.avg_entry_price[:n]
-        out[:, 3] = self.unrealized_pnl[:n]
-        out[:, 4] = self.exposure[:n]
-        out[:, 5] = self.asset_nav[:n]
+        out = np.empty((n, 6), dtype=np.float32)
+
+        # Hard check, not an assert: the kernel below reads without bounds checks
+        if n > self.num_envs:
+            raise ValueError(f"more symbols ({n}) than account lanes ({self.num_envs})")
+        cols = [col[:n] for col in self._account_soa]
+        if HAVE_NUMBA:
+            _fill_account_features(out, *cols)
+        else:
+            # One column-wise stack of the per-lane state arrays (cast to float32 on write)
+            np.stack(cols, axis=1, out=out)
         return out
 
 
@@ -82,7 +191,7 @@ class LocalAccount:
         Parameters
         ----------
         actions : array-like, shape (N,)
-            Per-slot action where 0=hold, 1=buy, 2=sell.
+            Per-slot action where 0=hold, 1=buy, 2=sell (handled as int8).
         prices : array-like, shape (N,)
             Current market price for each slot.
 
@@ -96,47 +205,63 @@ class LocalAccount:
         Returns
         -------
         np.ndarray
-            Reward computed as the change in net asset value (NAV).
+            Reward computed as the change in net asset value (NAV). The array
+            is an internal buffer that is overwritten by the next call; copy it
+            if it must outlive the current step.
         """
-        actions = np.asarray(actions, dtype=np.int64)
-        prices  = np.asarray(prices,  dtype=np.float64)
-
-        buy  = actions == 1
-        sell = (actions == 2) & (self.position_qty >= 1)
-
-        # Preserve current quantities before applying changes
-        old_qty = self.position_qty.copy()
-        new_qty = old_qty + buy.astype(np.int64) - sell.astype(np.int64)
+        actions = np.asarray(actions, dtype=np.int8)
+        prices  = np.asarray(prices,  dtype=np.float32)
+        # Hard check, not an assert: the kernel runs without bounds checks
+        if not (actions.shape == prices.shape == self.cash.shape):
+            raise ValueError(
+                f"expected one action and price per lane {self.cash.shape}, "
+                f"got actions {actions.shape} and prices {prices.shape}"
+            )
 
-        # Update cash balances
-        self.cash -= prices * buy
-        self.cash += prices * sell
+        if HAVE_NUMBA:
+            _apply_actions_kernel(
+                actions, prices, self.cash, self.position_qty, self.avg_entry_price, self.prev_nav,
+                self.exposure, self.unrealized_pnl, self.asset_nav, self._buf_reward,
+            )
+            return self._buf_reward
+
+        # Signed quantity change per lane: +1 buy, -1 sell (only with a position), 0 hold
+        buy, sell, delta = self._buf_buy, self._buf_sell, self._buf_delta
+        np.equal(actions, 1, out=buy)
+        np.greater_equal(self.position_qty, 1, out=sell)
+        np.logical_and(sell, np.equal(actions, 2, out=self._buf_mask), out=sell)
+        np.subtract(buy, sell, out=delta, dtype=np.int8)
+
+        # Update cash balances in one pass: cash -= price * delta
+        tmp = self._buf_f32
+        np.multiply(prices, delta, out=tmp)
+        self.cash -= tmp
+
+        # Weighted average entry price for buys, computed from the pre-trade quantity:
+        # (avg * qty + price) / (qty + 1), written only where buy is set
+        np.multiply(self.avg_entry_price, self.position_qty, out=tmp)
+        tmp += prices
+        np.add(self.position_qty, 1, out=self._buf_denom)
+        np.divide(tmp, self._buf_denom, out=tmp)
+        np.copyto(self.avg_entry_price, tmp, where=buy)
 
         # Commit updated quantities
-        self.position_qty[:] = new_qty
-
-        # Update average entry price for positions increased via buys
-        inc_mask = buy
-        with np.errstate(divide="ignore", invalid="ignore"):
-            self.avg_entry_price[inc_mask] = (
-                (self.avg_entry_price[inc_mask] * old_qty[inc_mask] + prices[inc_mask]) /
-                (old_qty[inc_mask] + 1.0)
-            )
+        self.position_qty += delta
 
         # Clear average price when the position is fully liquidated
-        zero_mask = self.position_qty == 0
-        self.avg_entry_price[zero_mask] = 0.0
+        np.equal(self.position_qty, 0, out=self._buf_mask)
+        np.copyto(self.avg_entry_price, 0.0, where=self._buf_mask)
 
-        # Recompute derived variables in order: exposure → unrealized_pnl → NAV → reward → group NAV
-        self.exposure[:] = self.position_qty * prices
-        self.unrealized_pnl[:] = (prices - self.avg_entry_price) * self.position_qty
+        # Recompute derived variables in order: exposure → unrealized_pnl → NAV → reward
+        np.multiply(self.position_qty, prices, out=self.exposure)
+        np.subtract(prices, self.avg_entry_price, out=self.unrealized_pnl)
+        self.unrealized_pnl *= self.position_qty
 
-        nav = self.cash + self.exposure
-        reward = (nav - self.prev_nav).astype(np.float32)
-        self.prev_nav[:] = nav
+        np.add(self.cash, self.exposure, out=self.asset_nav)  # per-slot NAV
+        reward = self._buf_reward
+        np.subtract(self.asset_nav, self.prev_nav, out=reward)
+        np.copyto(self.prev_nav, self.asset_nav)
 
-        self.asset_nav[:] = nav  # per-slot NAV
-        
         return reward
 
     # ------- episode reset for local simulation ------- #
@@ -155,17 +280,16 @@ class LocalAccount:
         if k == 0:
             return np.asarray([], dtype=object)
 
-        # Keep a scalar max_steps design: re-sample only on full reset
-        if indices is None:
-            self.max_steps[:] = self.rng.integers(self.max_step_range[0], self.max_step_range[1]+1, size=self.num_envs)
-        else:
-            self.max_steps[target] = self.rng.integers(self.max_step_range[0], self.max_step_range[1]+1, size=k)
+        # Take K draws per field from the pools instead of calling the generator
+        if self._rand_cursor + k > self._rand_pool_size:
+            self._refill_rand_pools()
+        draw = slice(self._rand_cursor, self._rand_cursor + k)
+        self._rand_cursor += k
 
-        # Sample fresh cash for target lanes
-        self.cash[target] = self.rng.uniform(self.budget_range[0], self.budget_range[1], size=k)
-
-        # Sample initial position quantities for target lanes
-        self.position_qty[target] = self.rng.integers(self.num_stocks_range[0], self.num_stocks_range[1] + 1, size=k)
+        # Re-sample episode lengths, fresh cash and initial positions for target lanes
+        self.max_steps[target] = self._rand_steps_pool[draw]
+        self.cash[target] = self._rand_cash_pool[draw]
+        self.position_qty[target] = self._rand_qty_pool[draw]
 
         # Reset derived state for target lanes
         self.avg_entry_price[target] = 0.0
@@ -179,6 +303,17 @@ class LocalAccount:
         return chosen
 
 
+    def _refill_rand_pools(self) -> None:
+        """Redraw the reset-time random pools and rewind the shared cursor."""
+        size = self._rand_pool_size
+        self._rand_steps_pool = self.rng.integers(
+            self.max_step_range[0], self.max_step_range[1] + 1, size=size, dtype=np.int32)
+        self._rand_cash_pool = self.rng.uniform(
+            self.budget_range[0], self.budget_range[1], size=size).astype(np.float32)
+        self._rand_qty_pool = self.rng.integers(
+            self.num_stocks_range[0], self.num_stocks_range[1] + 1, size=size, dtype=np.int32)
+        self._rand_cursor = 0
+
     def update_account(self, market_features: np.ndarray, indices: np.ndarray):
         """
         Update exposure, PnL, and NAV for the given lanes using market features.
@@ -194,7 +329,7 @@ class LocalAccount:
         idx = np.asarray(indices, dtype=int).reshape(-1)
         assert market_features.shape[0] == idx.size, "Market features must match indices"
 
-        prices = market_features[:, 3].astype(np.float64)  # close column
+        prices = np.asarray(market_features[:, 3], dtype=np.float32)  # close column
         self.exposure[idx] = self.position_qty[idx] * prices
         self.unrealized_pnl[idx] = (prices - self.avg_entry_price[idx]) * self.position_qty[idx]
         self.asset_nav[idx] = self.cash[idx] + self.exposure[idx]
@@ -203,12 +338,13 @@ class LocalAccount:
 
 
     # ---------- Query ---------- #
-    def step_account(self, order_results: Iterable[Dict[str, Any]], step_count: int):
+    def step_account(self, order_results: Union[OrderResultSoA, Iterable[Dict[str, Any]]], step_count: int):
         """
         Parameters
         ----------
-        order_results : list[dict]
-            Order results as returned from ``submit_orders``.
+        order_results : OrderResultSoA | list[dict]
+            Order results as returned from ``submit_orders``; per-order dicts
+            are still accepted and converted on the fly.
         step_count : int
             Current environment step index.
 
@@ -219,24 +355,28 @@ class LocalAccount:
             - ``reward`` is the change in NAV for each environment slot.
             - ``truncated`` is True when ``max_steps`` is exceeded.
             - ``terminated`` is True when cash falls below zero or a position becomes invalid.
+            All three are internal buffers overwritten by the next call.
         """
-        # Extract filled average prices from the order results
-        prices = np.array(
-            [o.get("filled_avg_price", 0.0) for o in order_results],
-            dtype=np.float64
-        )
+        if isinstance(order_results, OrderResultSoA):
+            prices, actions = order_results.filled_avg_price, order_results.action
+        else:
+            # Extract filled average prices from the order results
+            prices = np.array(
+                [o.get("filled_avg_price", 0.0) for o in order_results],
+                dtype=np.float32
+            )
 
-        # Default to hold (0) when the action is unspecified
-        actions = np.array(
-            [o.get("action", 0) for o in order_results],
-            dtype=np.int64
-        )
+            # Default to hold (0) when the action is unspecified
+            actions = np.array(
+                [o.get("action", 0) for o in order_results],
+                dtype=np.int8
+            )
 
         # Compute reward as the change in NAV
         reward = self.apply_actions(actions, prices)
 
         # Determine termination conditions
-        terminated = (self.cash <= 0)
-        truncated = np.full(self.num_envs, step_count >= self.max_steps, dtype=bool)
+        terminated = np.less_equal(self.cash, 0, out=self._buf_terminated)
+        truncated = np.greater_equal(step_count, self.max_steps, out=self._buf_truncated)
 
         return reward, truncated, terminated
@@ -1,10 +1,28 @@
 # Configuration settings for trading backends.
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Literal, Optional
+import sys
+from dataclasses import FrozenInstanceError, dataclass, fields
+from enum import IntEnum
+from functools import lru_cache, partial
+from typing import Literal, Optional, Union
 
 TradeMode = Literal["local", "paper", "real"]
-Broker    = Literal["alpaca", "binance", "ibkr"]
+
+class Broker(IntEnum):
+    """Supported brokers; TradingConfig also accepts their names as strings."""
+    ALPACA = 0
+    BINANCE = 1
+    IBKR = 2
+
+    @classmethod
+    def coerce(cls, value: Union["Broker", str]) -> "Broker":
+        """Return ``value`` as a Broker, accepting case-insensitive names."""
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls[str(value).upper()]
+        except KeyError:
+            raise ValueError(f"unsupported broker: {value!r}") from None
 
 BROKER_DEFAULTS = {
     "alpaca": dict(
@@ -12,7 +30,7 @@ BROKER_DEFAULTS = {
         trades_ws_url="wss://paper-api.alpaca.markets/stream",
         paper_rest_base="https://paper-api.alpaca.markets/v2",
         live_rest_base="https://api.alpaca.markets/v2",
-        data_rest_base=None,  # set in __post_init__ based on asset_type
+        data_rest_base=None,  # set in __init__ based on asset_type
     ),
     "binance": dict(
         market_ws_url="wss://stream.binance.com:9443/ws",
@@ -30,7 +48,54 @@ BROKER_DEFAULTS = {
     ),
 }
 
-@dataclass
+# Alpaca market-data REST bases: crypto uses v1beta3 (scope "us" aligns with
+# Alpaca's public crypto routes); stocks use v2
+_ALPACA_DATA_CRYPTO = sys.intern("https://data.alpaca.markets/v1beta3/crypto/us")
+_ALPACA_DATA_STOCKS = sys.intern("https://data.alpaca.markets/v2/stocks")
+
+# Intern the default URLs so every config built from them shares one string object
+for _defaults in BROKER_DEFAULTS.values():
+    for _field, _value in _defaults.items():
+        if isinstance(_value, str):
+            _defaults[_field] = sys.intern(_value)
+del _defaults, _field, _value
+
+def _fill_endpoint_defaults(cfg, *, market_ws_url, trades_ws_url, paper_rest_base,
+                            live_rest_base, data_rest_base) -> None:
+    """Fill blank endpoint fields of ``cfg`` with plain attribute writes."""
+    if not cfg.market_ws_url:
+        cfg.market_ws_url = market_ws_url
+    if not cfg.trades_ws_url:
+        cfg.trades_ws_url = trades_ws_url
+    if not cfg.paper_rest_base:
+        cfg.paper_rest_base = paper_rest_base
+    if not cfg.live_rest_base:
+        cfg.live_rest_base = live_rest_base
+    if not cfg.data_rest_base:
+        cfg.data_rest_base = data_rest_base
+
+# Filler with each broker's BROKER_DEFAULTS bound, indexed by Broker value; built once at import
+_BROKER_FILLERS = tuple(
+    partial(_fill_endpoint_defaults, **BROKER_DEFAULTS[b.name.lower()]) for b in Broker
+)
+
+# The same defaults as plain (market_ws, trades_ws, paper_rest, live_rest, data_rest)
+# tuples, for configs that leave every endpoint unset
+_BROKER_ENDPOINTS = tuple(
+    tuple(BROKER_DEFAULTS[b.name.lower()][f] for f in (
+        "market_ws_url", "trades_ws_url", "paper_rest_base", "live_rest_base", "data_rest_base"))
+    for b in Broker
+)
+
+# Default for endpoint arguments, so "left unset" is told apart from "set blank"
+_UNSET = object()
+
+@lru_cache(maxsize=64)
+def _is_crypto_asset(asset_type: str) -> bool:
+    """True for crypto asset codes such as "Crypto/Spot" (memoized; few distinct codes)."""
+    return asset_type.lower().startswith("crypto")
+
+@dataclass(slots=True, init=False)
 class TradingConfig:
     """Container for API credentials and endpoint configuration."""
     broker: Broker
@@ -54,31 +119,163 @@ class TradingConfig:
     recv_timeout_sec: float = 1.0
     rest_rps: float = 5.0
     rest_burst: int = 10
+    rest_rps_min: float = 0.5    # floor when 429s halve the REST rate
+    rest_rps_step: float = 0.5   # additive recovery per successful request
+    account_ttl_sec: float = 0.25  # reuse the /account + /positions snapshot this long (0 = always refetch)
     ws_pull_rps: float = 20.0
     ws_pull_burst: int = 50
 
+    # WebSocket connection options; set ws_compression="deflate" for brokers whose
+    # large payloads (e.g. depth books) benefit from permessage-deflate
+    ws_compression: Optional[str] = None
+    ws_max_size: int = 2**20
+    ws_ping_interval: float = 20.0
+    ws_ping_timeout: float = 10.0
+
     # Optional bars timeframe for REST backfill
     bars_timeframe: str = "1Min"
 
-    def __post_init__(self):
-        if not self.broker:
+    # Hand-written in place of the generated __init__ + __post_init__: validates
+    # first, then writes each slot once. Defaults mirror the field declarations.
+    def __init__(
+        self,
+        broker: Union[Broker, str],
+        api_key: str,
+        secret_key: str,
+        *,
+        trade_mode: TradeMode = "local",
+        country_code: str = "US",
+        exchange_code: str = "XNYS",
+        asset_type: str = "ESXXXX",
+        market_ws_url: str = _UNSET,
+        trades_ws_url: str = _UNSET,
+        paper_rest_base: str = _UNSET,
+        live_rest_base: str = _UNSET,
+        data_rest_base: Optional[str] = _UNSET,
+        recv_timeout_sec: float = 1.0,
+        rest_rps: float = 5.0,
+        rest_burst: int = 10,
+        rest_rps_min: float = 0.5,
+        rest_rps_step: float = 0.5,
+        account_ttl_sec: float = 0.25,
+        ws_pull_rps: float = 20.0,
+        ws_pull_burst: int = 50,
+        ws_compression: Optional[str] = None,
+        ws_max_size: int = 2**20,
+        ws_ping_interval: float = 20.0,
+        ws_ping_timeout: float = 10.0,
+        bars_timeframe: str = "1Min",
+    ):
+        if not isinstance(broker, Broker) and not broker:  # Broker.ALPACA == 0 is falsy
             raise ValueError("broker is required")
-        if not self.api_key:
+        if not api_key:
             raise ValueError("api_key is required")
-        if not self.secret_key:
+        if not secret_key:
             raise ValueError("secret_key is required")
+        broker = Broker.coerce(broker)
+
+        self.broker = broker
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.trade_mode = trade_mode
+        self.country_code = country_code
+        self.exchange_code = exchange_code
+        self.asset_type = asset_type
+        self.recv_timeout_sec = recv_timeout_sec
+        self.rest_rps = rest_rps
+        self.rest_burst = rest_burst
+        self.rest_rps_min = rest_rps_min
+        self.rest_rps_step = rest_rps_step
+        self.account_ttl_sec = account_ttl_sec
+        self.ws_pull_rps = ws_pull_rps
+        self.ws_pull_burst = ws_pull_burst
+        self.ws_compression = ws_compression
+        self.ws_max_size = ws_max_size
+        self.ws_ping_interval = ws_ping_interval
+        self.ws_ping_timeout = ws_ping_timeout
+        self.bars_timeframe = bars_timeframe
 
-        # Base defaults
-        defaults = BROKER_DEFAULTS.get(self.broker.lower(), {})
-        for field, value in defaults.items():
-            if not getattr(self, field):
-                setattr(self, field, value)
+        # Base defaults: the common all-unset case copies the broker's endpoints
+        # wholesale; otherwise fill only the blank ones
+        if (market_ws_url is _UNSET and trades_ws_url is _UNSET and paper_rest_base is _UNSET
+                and live_rest_base is _UNSET and data_rest_base is _UNSET):
+            (self.market_ws_url, self.trades_ws_url, self.paper_rest_base,
+             self.live_rest_base, self.data_rest_base) = _BROKER_ENDPOINTS[broker]
+        else:
+            self.market_ws_url = "" if market_ws_url is _UNSET else market_ws_url
+            self.trades_ws_url = "" if trades_ws_url is _UNSET else trades_ws_url
+            self.paper_rest_base = "" if paper_rest_base is _UNSET else paper_rest_base
+            self.live_rest_base = "" if live_rest_base is _UNSET else live_rest_base
+            self.data_rest_base = None if data_rest_base is _UNSET else data_rest_base
+            _BROKER_FILLERS[broker](self)
 
         # Smart default for data_rest_base when using Alpaca
-        if self.broker.lower() == "alpaca" and not self.data_rest_base:
-            # Crypto uses v1beta3; stocks use v2
-            if str(self.asset_type).lower().startswith("crypto"):
-                # scope "us" aligns with Alpaca’s public crypto routes
-                self.data_rest_base = "https://data.alpaca.markets/v1beta3/crypto/us"
-            else:
-                self.data_rest_base = "https://data.alpaca.markets/v2/stocks"
+        if broker is Broker.ALPACA and not self.data_rest_base:
+            self.data_rest_base = _ALPACA_DATA_CRYPTO if _is_crypto_asset(asset_type) else _ALPACA_DATA_STOCKS
+
+    @classmethod
+    @lru_cache(maxsize=128)
+    def get(
+        cls,
+        broker: Union[Broker, str],
+        api_key: str,
+        secret_key: str,
+        trade_mode: TradeMode = "local",
+        country_code: str = "US",
+        exchange_code: str = "XNYS",
+        asset_type: str = "ESXXXX",
+    ) -> "TradingConfig":
+        """
+        Return a shared, read-only config for these arguments, building it on
+        first use. Instances are cached (LRU, 128 entries) and shared between
+        callers, so assigning to any field raises FrozenInstanceError; build a
+        TradingConfig directly for a private, mutable copy.
+
+        The cache holds the instances, and so ``api_key``/``secret_key``, until
+        they are evicted or ``TradingConfig.get.cache_clear()`` is called.
+        """
+        return _FrozenTradingConfig(
+            broker, api_key, secret_key,
+            trade_mode=trade_mode,
+            country_code=country_code,
+            exchange_code=exchange_code,
+            asset_type=asset_type,
+        )
+
+
+_CONFIG_FIELDS = tuple(f.name for f in fields(TradingConfig))
+
+
+class _FrozenTradingConfig(TradingConfig):
+    """
+    Read-only TradingConfig shared by :meth:`TradingConfig.get`. Compares equal
+    to any TradingConfig with the same field values; ``dataclasses.replace``
+    on one returns another frozen instance.
+    """
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        # Validate and fill defaults through the regular constructor, then copy the
+        # slots in past the write guard below
+        src = TradingConfig(*args, **kwargs)
+        for name in _CONFIG_FIELDS:
+            object.__setattr__(self, name, getattr(src, name))
+
+    def __eq__(self, other):
+        # The generated __eq__ requires identical classes; compare fields only.
+        # As a subclass method this also runs for ``TradingConfig(...) == frozen``.
+        if not isinstance(other, TradingConfig):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in _CONFIG_FIELDS)
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field {name!r} of a shared TradingConfig")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field {name!r} of a shared TradingConfig")
+
+    def __setstate__(self, state):
+        # copy/pickle restore slot values through here rather than setattr
+        _, slots = state
+        for name, value in slots.items():
+            object.__setattr__(self, name, value)
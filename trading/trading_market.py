@@ -9,6 +9,8 @@ import json
 import threading
 import time
 import logging
+from functools import lru_cache
+from operator import itemgetter
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Literal, Tuple, Callable
 
@@ -17,34 +19,166 @@ import websockets
 from websockets.legacy.client import WebSocketClientProtocol
 import numpy as np
 
+try:  # optional fast JSON codecs for WebSocket frames and REST bodies
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:  # fall back to the stdlib codec
+    ujson = None
+
 # Project-local imports
-from .trading_config import TradingConfig
+from .trading_config import _ALPACA_DATA_CRYPTO, _ALPACA_DATA_STOCKS, Broker, TradingConfig, _is_crypto_asset
 from .asset_utils import COUNTRY_MAP, EXCHANGE_MAP, ASSET_TYPE_MAP
+from .local_account import OrderResultSoA
 
 TradeMode = Literal["local", "paper", "real"]
 
+# JSON codec for WebSocket frames and REST bodies: orjson parses str/bytes
+# directly and is several times faster than the stdlib on market-data payloads;
+# ujson is the next best. ``_json_body`` may return bytes (aiohttp takes either).
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_body = orjson.dumps
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+elif ujson is not None:
+    _json_loads = ujson.loads
+    _json_dumps = _json_body = ujson.dumps
+else:
+    _json_loads = json.loads
+    _json_dumps = _json_body = json.dumps
+
+
+# REST socket limits shared by the session and every request; a per-call timeout
+# only sets the overall deadline on top of them
+_REST_SOCK_CONNECT = 2.0
+_REST_SOCK_READ = 5.0
+
+
+@lru_cache(maxsize=16)
+def _rest_timeout(total: Optional[float]) -> aiohttp.ClientTimeout:
+    """ClientTimeout with the shared socket limits and ``total`` as the deadline (one per value)."""
+    return aiohttp.ClientTimeout(total=total, sock_connect=_REST_SOCK_CONNECT, sock_read=_REST_SOCK_READ)
+
+
+def _as_symbol_list(symbols) -> List[str]:
+    """Return ``symbols`` as a list, passing lists through without copying."""
+    if isinstance(symbols, list):
+        return symbols
+    if isinstance(symbols, np.ndarray):
+        return symbols.tolist()
+    return list(symbols)
+
+
+def _dedup_preserve(items) -> list:
+    """Drop repeated items from ``items``, keeping first-seen order."""
+    seen = set()
+    seen_add = seen.add
+    return [x for x in items if not (x in seen or seen_add(x))]
+
+
+def _bars_frame(action: str, symbols) -> str:
+    """Serialize a bars (un)subscribe frame for the market channel."""
+    return _json_dumps({"action": action, "bars": list(symbols)})
+
+
+_BAR_KEYS = ("o", "h", "l", "c", "v", "t")
+_NO_BAR: Dict[str, Any] = {}  # shared stand-in for a cache miss; never mutated
+_BAR_GETTER = itemgetter(*_BAR_KEYS)
+_NO_POSITION = (0.0, 0.0)  # (qty, avg_entry_price) for symbols without a position
+
+
+def _norm_bar_tuple(d: Dict[str, Any], default_t: float) -> Tuple[float, float, float, float, float, float]:
+    """
+    Return ``(o, h, l, c, v, t)`` floats from a raw bar dict. ``c`` falls back to
+    ``price``; a missing or non-numeric ``t`` becomes ``default_t``.
+    """
+    g = d.get
+    try:
+        t = float(g("t"))
+    except (TypeError, ValueError):
+        t = default_t
+    return (float(g("o", 0.0)), float(g("h", 0.0)), float(g("l", 0.0)),
+            float(g("c", 0.0) or g("price", 0.0) or 0.0), float(g("v", 0.0)), t)
+
+
+def _latest_price(bar: Optional[Dict[str, Any]]) -> float:
+    """Close (or ``price``) of a cached bar; 0.0 for a missing bar or price."""
+    return float(bar.get("c") or bar.get("price") or 0.0) if bar else 0.0
+
+
+# With eager tasks (Python 3.12+), ``wait_for(ws.recv(), timeout=0)`` completes for
+# frames that are already buffered; without them it always times out, so
+# _channel_loop only drains extra frames when eager tasks are available
+_EAGER_TASKS = hasattr(asyncio, "eager_task_factory")
+
+# Bars timeframe -> Binance kline interval
+_BINANCE_INTERVALS = {"1min": "1m", "1m": "1m", "5min": "5m", "5m": "5m"}
+
+
+# Order side names indexed by action code (0=hold, 1=buy, 2=sell); object dtype so
+# the gather yields the plain str objects that go into order payloads
+_SIDE_NAMES = np.array(["hold", "buy", "sell"], dtype=object)
+_SIDE_ACTIONS = {"hold": 0, "buy": 1, "sell": 2}  # inverse of _SIDE_NAMES
+
+# Skipped-lane result templates by reason; submit_orders copies one and adds the symbol
+_SKIPPED: Dict[str, Dict[str, Any]] = {
+    reason: {"skipped": True, "reason": reason}
+    for reason in ("not_subscribed", "duplicate_lane", "error")
+}
+
+# Alpaca trades-stream subscribe frames: v2-style subscribe (no-op if
+# unsupported) followed by the legacy listen API (paper stream)
+_ALPACA_TRADES_SUBSCRIBE_FRAMES = (
+    _json_dumps({"action": "subscribe", "orders": ["*"], "account": ["*"]}),
+    _json_dumps({"action": "listen", "data": {"streams": ["trade_updates", "account_updates"]}}),
+)
+
 
 # ------------------------------- Async token bucket ------------------------------- #
 class _TokenBucket:
-    def __init__(self, capacity: int, rps: float):
+    def __init__(self, capacity: int, rps: float, *, min_rps: Optional[float] = None, rps_step: float = 0.0):
         self.capacity = float(capacity)
         self.tokens = float(capacity)
         self.rps = float(rps)
+        # AIMD bounds: rate halves toward min_rps on throttling, recovers by rps_step up to max_rps
+        self.max_rps = self.rps
+        self.min_rps = min(self.rps, float(min_rps)) if min_rps is not None else self.rps
+        self.rps_step = float(rps_step)
         self._last = time.time()
         self._lock = asyncio.Lock()
 
+    def _refill(self) -> None:
+        now = time.time()
+        dt = now - self._last
+        if dt > 0:
+            self.tokens = min(self.capacity, self.tokens + dt * self.rps)
+            self._last = now
+
+    def decrease_rate(self) -> None:
+        """Halve the refill rate (not below ``min_rps``) after a throttled request."""
+        self._refill()  # bank tokens accrued at the old rate first
+        self.rps = max(self.min_rps, self.rps / 2.0)
+
+    def increase_rate(self) -> None:
+        """Raise the refill rate by ``rps_step`` (not above ``max_rps``) after a success."""
+        if self.rps < self.max_rps:
+            self._refill()
+            self.rps = min(self.max_rps, self.rps + self.rps_step)
+
     async def acquire(self, cost: float = 1.0) -> None:
         while True:
             async with self._lock:
-                now = time.time()
-                dt = now - self._last
-                if dt > 0:
-                    self.tokens = min(self.capacity, self.tokens + dt * self.rps)
-                    self._last = now
+                self._refill()
                 if self.tokens >= cost:
                     self.tokens -= cost
                     return
-            await asyncio.sleep(0.01)
+                # Sleep until enough tokens should have accrued, outside the lock
+                wait = (cost - self.tokens) / self.rps if self.rps > 0 else 0.01
+            await asyncio.sleep(max(wait, 0.0))
 
 
 @dataclass
@@ -72,7 +206,8 @@ class TradingMarket:
       - ``get_market_snapshot(symbols)`` → ``{sym: {"o","h","l","c","v","t"}}``
       - ``get_account_snapshot(symbols)`` → per-symbol account state
       - ``submit_orders(symbols, sides, qtys, trade_mode)`` → list of order
-        results (local mode requires ``{"filled_avg_price", "action"}``)
+        results, or an ``OrderResultSoA`` of per-lane fill prices and action
+        codes in local mode
       - ``step_account(order_results)`` → ``(reward, truncated, terminated)``
       - ``close()`` to release all resources
     """
@@ -81,24 +216,47 @@ class TradingMarket:
     def __init__(self, *, trading_config: TradingConfig, symbols: Optional[List[str]] = None):
         self.cfg = trading_config
         self.trade_mode: TradeMode = trading_config.trade_mode
-        self.init_symbols: List[str] = list(dict.fromkeys(symbols or []))
+        self.init_symbols: List[str] = _dedup_preserve(symbols or [])
         self.freeze_subscriptions = (self.trade_mode != "local")
         self.logger = logging.getLogger(__name__)
 
+        # Auth frame is fixed for the client's lifetime; serialize it once for all (re)connects
+        self._auth_frame = _json_dumps({"action": "auth", "key": self.cfg.api_key, "secret": self.cfg.secret_key})
+
         # IDs used in observation asset_id
         self.country_id = COUNTRY_MAP.get(self.cfg.country_code, 1)
         self.exchange_id = EXCHANGE_MAP.get(self.country_id, {}).get(self.cfg.exchange_code, 1)
         self.asset_type = ASSET_TYPE_MAP.get(self.cfg.asset_type, 1)
 
-        # Shared caches protected by ``_cache_lock``
+        # Backfill endpoint settings are fixed by the config; resolve them once
+        # instead of per fetch
+        self._data_rest_base = self.data_rest_base
+        self._bars_tf = self.bars_timeframe
+        self._binance_interval = _BINANCE_INTERVALS.get(self._bars_tf.lower(), "1m")
+        self._is_crypto = _is_crypto_asset(self.cfg.asset_type or "")
+
+        # Shared caches protected by ``_cache_lock``. The market cache is copy-on-write:
+        # writers (holding the lock) publish a new dict, so readers just grab the
+        # current reference and never block on WS ingest
         self._cache_lock = threading.Lock()
+        self._cache_cv = threading.Condition(self._cache_lock)  # notified on every market cache write
         self._market_cache: Dict[str, Dict[str, Any]] = {}   # symbol → latest bar
         self._account_cache: Dict[str, Any] = {}             # account fields & NAV
         self._orders_cache: Dict[str, Dict[str, Any]] = {}   # order_id → payload
-        self._subscribed: set[str] = set()
+        self._subscribed: frozenset[str] = frozenset()   # replaced wholesale, never mutated
+
+        # Last (account, positions) REST snapshot, reused for cfg.account_ttl_sec. Order
+        # activity bumps _account_gen (from either thread); a snapshot is only reused
+        # while the generation it was fetched under is still current, so an
+        # invalidation that lands mid-fetch is never overwritten. Published as one
+        # (generation, fetch-start ns, snapshot) tuple.
+        self._account_gen = 0
+        self._account_entry: Tuple[int, int, Tuple[Dict[str, Any], List[Dict[str, Any]]]] = (-1, 0, ({}, []))
+        self._account_ttl_ns = int(self.cfg.account_ttl_sec * 1e9)
 
         # Rate limiting
-        self._rl_rest = _TokenBucket(self.cfg.rest_burst, self.cfg.rest_rps)
+        self._rl_rest = _TokenBucket(self.cfg.rest_burst, self.cfg.rest_rps,
+                                     min_rps=self.cfg.rest_rps_min, rps_step=self.cfg.rest_rps_step)
         self._rl_ws = _TokenBucket(self.cfg.ws_pull_burst, self.cfg.ws_pull_rps)
 
         # Async resources (only accessed from the loop thread)
@@ -109,6 +267,12 @@ class TradingMarket:
         self._trades_task: Optional[asyncio.Task] = None
         self._stop_evt: Optional[asyncio.Event] = None
 
+        # Channel definitions (market, trades), built once for all (re)connects
+        self._channels: Tuple[_Channel, _Channel] = (
+            _Channel("market", "market_ws_url", "_market_ws", "_market_task", self._parse_market_message, "market"),
+            _Channel("trades", "trades_ws_url", "_trades_ws", "_trades_task", self._parse_trade_message, "trades"),
+        )
+
         # Private event loop in a daemon thread
         self._loop = asyncio.new_event_loop()
         self._thread = threading.Thread(target=self._run_loop, name="AlpacaLoop", daemon=True)
@@ -126,14 +290,11 @@ class TradingMarket:
             self.connect_trades()
 
     # -------------------------------- internals -------------------------------- #
-    def _channel_defs(self) -> List[_Channel]:
-        return [
-            _Channel("market", "market_ws_url", "_market_ws", "_market_task", self._parse_market_message, "market"),
-            _Channel("trades", "trades_ws_url", "_trades_ws", "_trades_task", self._parse_trade_message, "trades"),
-        ]
-
     def _run_loop(self) -> None:
         asyncio.set_event_loop(self._loop)
+        # Python 3.12+: tasks that finish without suspending run inline, no loop hop
+        if hasattr(asyncio, "eager_task_factory"):
+            self._loop.set_task_factory(asyncio.eager_task_factory)
         try:
             self._loop.run_forever()
         finally:
@@ -146,16 +307,41 @@ class TradingMarket:
             self._loop.close()
 
     def _submit(self, coro, *, timeout: Optional[float] = None):
+        """
+        Run ``coro`` on the private loop and block for its result. The sync API
+        built on this cannot be used from the loop thread itself (blocking there
+        would deadlock), so that raises; loop-side code awaits the coroutine.
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            coro.close()  # never scheduled
+            raise RuntimeError(
+                "TradingMarket's blocking API was called from its own event loop thread; "
+                "await the underlying coroutine instead"
+            )
         fut = asyncio.run_coroutine_threadsafe(coro, self._loop)
         return fut.result(timeout=timeout)
 
     async def _ensure_session(self) -> aiohttp.ClientSession:
         if self._session is None:
-            self._session = aiohttp.ClientSession(headers={
-                "APCA-API-KEY-ID": self.cfg.api_key,
-                "APCA-API-SECRET-KEY": self.cfg.secret_key,
-                "Content-Type": "application/json",
-            })
+            # One pooled session for all REST traffic: sockets and TLS sessions are
+            # reused across backfill, account polling and order calls
+            connector = aiohttp.TCPConnector(
+                limit=64, limit_per_host=16, ttl_dns_cache=300,
+                keepalive_timeout=60, enable_cleanup_closed=True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={
+                    "APCA-API-KEY-ID": self.cfg.api_key,
+                    "APCA-API-SECRET-KEY": self.cfg.secret_key,
+                    "Content-Type": "application/json",
+                },
+                timeout=_rest_timeout(None),
+            )
         return self._session
 
     # ------------------------------- Endpoints ------------------------------- #
@@ -173,15 +359,12 @@ class TradingMarket:
         if getattr(self.cfg, "data_rest_base", None):
             return self.cfg.data_rest_base.rstrip("/")
 
-        b = (self.cfg.broker or "").lower()
-        a = (self.cfg.asset_type or "").lower()
+        b = self.cfg.broker
 
-        if b == "alpaca":
+        if b is Broker.ALPACA:
             # Crypto uses v1beta3; stocks use v2
-            return ("https://data.alpaca.markets/v1beta3/crypto/us"
-                    if a.startswith("crypto") else
-                    "https://data.alpaca.markets/v2/stocks")
-        if b == "binance":
+            return _ALPACA_DATA_CRYPTO if _is_crypto_asset(self.cfg.asset_type or "") else _ALPACA_DATA_STOCKS
+        if b is Broker.BINANCE:
             return "https://api.binance.com/api"
         # Fallback to trading REST base if nothing else
         return (self.cfg.paper_rest_base if self.trade_mode == "paper" else self.cfg.live_rest_base).rstrip("/")
@@ -193,16 +376,16 @@ class TradingMarket:
 
     # ------------------------------- Lifecycle (sync wrappers) ------------------------------- #
     def connect_market(self) -> None:
-        self._submit(self._connect_channel_async(self._channel_defs()[0]))
+        self._submit(self._connect_channel_async(self._channels[0]))
 
     def connect_trades(self) -> None:
-        self._submit(self._connect_channel_async(self._channel_defs()[1]))
+        self._submit(self._connect_channel_async(self._channels[1]))
 
     def close_market(self) -> None:
-        self._submit(self._close_channel_async(self._channel_defs()[0]))
+        self._submit(self._close_channel_async(self._channels[0]))
 
     def close_trades(self) -> None:
-        self._submit(self._close_channel_async(self._channel_defs()[1]))
+        self._submit(self._close_channel_async(self._channels[1]))
 
     def close(self) -> None:
         self._submit(self._close_all_async())
@@ -241,8 +424,16 @@ class TradingMarket:
     async def _connect_channel_async(self, ch: _Channel) -> None:
         await self._ensure_session()
         self._stop_evt = self._stop_evt or asyncio.Event()
-        ws = await websockets.connect(getattr(self.cfg, ch.url_attr))
-        await self._send_ws(ws, {"action": "auth", "key": self.cfg.api_key, "secret": self.cfg.secret_key})
+        cfg = self.cfg
+        ws = await websockets.connect(
+            getattr(cfg, ch.url_attr),
+            compression=cfg.ws_compression,  # off by default: bar frames are small
+            max_size=cfg.ws_max_size,
+            ping_interval=cfg.ws_ping_interval,
+            ping_timeout=cfg.ws_ping_timeout,
+            close_timeout=2,
+        )
+        await self._send_ws_frame(ws, self._auth_frame)
         _ = await self._recv_ws(ws, self.cfg.recv_timeout_sec)
         setattr(self, ch.ws_attr, ws)
         # market channel subscribes initial symbols
@@ -251,13 +442,10 @@ class TradingMarket:
             
         # trades channel may require an explicit subscribe for order/account streams (broker-specific)
         if ch.kind == "trades":
-            broker = getattr(self.cfg, "broker", "").lower()
             # Alpaca compatibility: try modern and legacy payloads
-            if broker == "alpaca":
-                # v2-style subscribe (no-op if unsupported)
-                await self._send_ws(ws, {"action": "subscribe", "orders": ["*"], "account": ["*"]})
-                # legacy listen API (paper stream)
-                await self._send_ws(ws, {"action": "listen", "data": {"streams": ["trade_updates", "account_updates"]}})
+            if self.cfg.broker is Broker.ALPACA:
+                for frame in _ALPACA_TRADES_SUBSCRIBE_FRAMES:
+                    await self._send_ws_frame(ws, frame)
             
         task = asyncio.create_task(self._channel_loop(ch))
         setattr(self, ch.task_attr, task)
@@ -279,8 +467,8 @@ class TradingMarket:
         if self._stop_evt:
             self._stop_evt.set()
         # Close trades then market (mirrors original ordering)
-        await self._close_channel_async(self._channel_defs()[1])
-        await self._close_channel_async(self._channel_defs()[0])
+        await self._close_channel_async(self._channels[1])
+        await self._close_channel_async(self._channels[0])
         if self._session:
             with contextlib.suppress(Exception):
                 await self._session.close()
@@ -296,20 +484,35 @@ class TradingMarket:
             if not raw:
                 continue
             try:
-                msg = json.loads(raw) if isinstance(raw, (bytes, bytearray, str)) else raw
                 if ch.kind == "market":
-                    pairs = ch.parser(msg)  # list[(symbol, payload)]
-                    if not pairs:
+                    # Take any frames that are already buffered too, then apply the
+                    # merged bars (latest per symbol) under one lock acquisition
+                    batch = [raw]
+                    if _EAGER_TASKS:
+                        extra = await self._drain_ws(ws, int(self._rl_ws.capacity) - 1)
+                        if extra:
+                            await self._rl_ws.acquire(len(extra))
+                            batch += extra
+                    merged: Dict[str, Dict[str, Any]] = {}
+                    for frame in batch:
+                        try:
+                            merged.update(ch.parser(_json_loads(frame)))  # list[(symbol, payload)]
+                        except Exception:
+                            continue  # skip a malformed frame, keep the rest of the batch
+                    if not merged:
                         continue
                     with self._cache_lock:
-                        for sym, payload in pairs:
-                            self._market_cache[sym] = payload
+                        self._store_bars_locked(merged.items())
                 else:
+                    msg = _json_loads(raw)  # _recv_ws yields str | bytes; the codec takes both
                     kind, payload = ch.parser(msg)
+                    if kind == "order" and payload:
+                        oid = payload.get("id")
+                        oid = f"order-{int(time.time()*1e6)}" if oid is None else str(oid)
                     with self._cache_lock:
                         if kind == "order" and payload:
-                            oid = str(payload.get("id", f"order-{int(time.time()*1e6)}"))
                             self._orders_cache[oid] = payload
+                            self._account_gen += 1  # fills move cash/positions
                         elif kind == "account" and payload:
                             self._account_cache.update(payload)
             except Exception:
@@ -317,12 +520,27 @@ class TradingMarket:
 
     # ------------------------------- WS helpers ------------------------------- #
     async def _send_ws(self, ws: WebSocketClientProtocol, obj: Dict[str, Any]) -> None:
+        await self._send_ws_frame(ws, _json_dumps(obj))
+
+    async def _send_ws_frame(self, ws: WebSocketClientProtocol, frame: str) -> None:
+        """Send an already-serialized text frame."""
         try:
-            await ws.send(json.dumps(obj))
+            await ws.send(frame)
         except Exception:
             pass
 
+    async def _drain_ws(self, ws: WebSocketClientProtocol, limit: int) -> list:
+        """Return up to ``limit`` frames that ``ws`` can hand over without waiting."""
+        frames = []
+        while len(frames) < limit:
+            try:
+                frames.append(await asyncio.wait_for(ws.recv(), timeout=0))
+            except Exception:  # TimeoutError once the buffer is empty
+                break
+        return frames
+
     async def _recv_ws(self, ws: WebSocketClientProtocol, timeout: float):
+        """Return the next text (str) or binary (bytes) frame, or None on timeout/error."""
         try:
             return await asyncio.wait_for(ws.recv(), timeout=timeout)
         except Exception:
@@ -350,31 +568,39 @@ class TradingMarket:
         self._submit(self._unsubscribe_async(symbols))
 
     async def _subscribe_async(self, symbols: List[str]) -> None:
-        add = [s for s in symbols if s not in self._subscribed]
+        add = frozenset(symbols) - self._subscribed
         if not add:
             return
-        self._subscribed.update(add)
+        self._subscribed = self._subscribed | add
         if self._market_ws:
-            await self._send_ws(self._market_ws, {"action": "subscribe", "bars": add})
+            await self._send_ws_frame(self._market_ws, _bars_frame("subscribe", add))
 
     async def _unsubscribe_async(self, symbols: List[str]) -> None:
-        rm = [s for s in symbols if s in self._subscribed]
+        rm = self._subscribed.intersection(symbols)
         if not rm:
             return
-        for s in rm:
-            self._subscribed.discard(s)
+        self._subscribed = self._subscribed - rm
         if self._market_ws:
-            await self._send_ws(self._market_ws, {"action": "unsubscribe", "bars": rm})
+            await self._send_ws_frame(self._market_ws, _bars_frame("unsubscribe", rm))
 
     # ------------------------------- REST helpers ------------------------------- #
+    def _note_rest_status(self, status: int) -> None:
+        """Adapt the REST rate to the broker's answer: back off on 429, recover on 2xx."""
+        if status == 429:
+            self._rl_rest.decrease_rate()
+        elif status // 100 == 2:
+            self._rl_rest.increase_rate()
+
     async def _rest_get_json(self, base: str, path: str, *, timeout: float = 5.0) -> Tuple[int, Any]:
         await self._rl_rest.acquire()
         sess = await self._ensure_session()
         url = f"{base.rstrip('/')}/{path.lstrip('/')}"
         try:
-            async with sess.get(url, timeout=timeout) as r:
-                data = await (r.json() if r.status // 100 == 2 else asyncio.sleep(0))
-                return r.status, (data if r.status // 100 == 2 else None)
+            async with sess.get(url, timeout=_rest_timeout(timeout)) as r:
+                self._note_rest_status(r.status)
+                if r.status // 100 != 2:
+                    return r.status, None
+                return r.status, await r.json()
         except Exception:
             return 0, None
 
@@ -383,9 +609,11 @@ class TradingMarket:
         sess = await self._ensure_session()
         url = f"{base.rstrip('/')}/{path.lstrip('/')}"
         try:
-            async with sess.post(url, data=json.dumps(payload), timeout=timeout) as r:
-                data = await (r.json() if r.status // 100 == 2 else asyncio.sleep(0))
-                return r.status, (data if r.status // 100 == 2 else None)
+            async with sess.post(url, data=_json_body(payload), timeout=_rest_timeout(timeout)) as r:
+                self._note_rest_status(r.status)
+                if r.status // 100 != 2:
+                    return r.status, None
+                return r.status, await r.json()
         except Exception:
             return 0, None
 
@@ -394,7 +622,8 @@ class TradingMarket:
         sess = await self._ensure_session()
         url = f"{base.rstrip('/')}/{path.lstrip('/')}"
         try:
-            async with sess.delete(url, timeout=timeout) as r:
+            async with sess.delete(url, timeout=_rest_timeout(timeout)) as r:
+                self._note_rest_status(r.status)
                 return r.status
         except Exception:
             return 0
@@ -408,137 +637,144 @@ class TradingMarket:
         return self._update_cache_from_snapshot(snap)
 
     def _norm_bar(self, d: dict, default_t: float) -> dict:
-        return {
-            "o": float(d.get("o", 0.0)),
-            "h": float(d.get("h", 0.0)),
-            "l": float(d.get("l", 0.0)),
-            "c": float(d.get("c", 0.0) or d.get("price", 0.0)),
-            "v": float(d.get("v", 0.0)),
-            "t": d.get("t", default_t),
-        }
+        return dict(zip(_BAR_KEYS, _norm_bar_tuple(d, default_t)))
 
     def _update_cache_from_snapshot(self, snap_dict: Dict[str, Dict[str, Any]]) -> int:
         """Update the market cache with a snapshot of bar data."""
         if not snap_dict:
             return 0
         t_val = (time.time() / 86400.0)
-        updated = 0
         with self._cache_lock:
-            for sym, bar in snap_dict.items():
-                self._market_cache[sym] = self._norm_bar(bar, t_val)
-                updated += 1
-        return updated
+            self._store_bars_locked((sym, self._norm_bar(bar, t_val)) for sym, bar in snap_dict.items())
+        return len(snap_dict)
+
+    def _store_bars_locked(self, pairs) -> None:
+        """Write ``(symbol, bar)`` pairs into the market cache; caller holds ``_cache_lock``."""
+        cache = dict(self._market_cache)
+        cache.update(pairs)
+        self._market_cache = cache  # publish the new snapshot in one reference swap
+        self._cache_cv.notify_all()
     
     async def _rest_get_latest_bars(self, symbols: List[str], *, timeout_sec: float = 1.0) -> Dict[str, Dict[str, Any]]:
         """Dispatcher to broker/asset-specific bar fetchers."""
-        broker = (self.cfg.broker or "").lower()
-        is_crypto = (self.cfg.asset_type or "").lower().startswith("crypto")
-        if broker == "alpaca" and not is_crypto:
+        broker = self.cfg.broker
+        is_crypto = self._is_crypto
+        if broker is Broker.ALPACA and not is_crypto:
             return await self._rest_get_latest_bars_alpaca_stocks(symbols, timeout_sec=timeout_sec)
-        if broker == "alpaca" and is_crypto:
+        if broker is Broker.ALPACA and is_crypto:
             return await self._rest_get_latest_bars_alpaca_crypto(symbols, timeout_sec=timeout_sec)
-        if broker == "binance":
+        if broker is Broker.BINANCE:
             return await self._rest_get_latest_bars_binance(symbols, timeout_sec=timeout_sec)
         # Generic fallback (treat like Alpaca stocks path shape)
         return await self._rest_get_latest_bars_generic(symbols, timeout_sec=timeout_sec)
 
     # ------------------------------- per-broker helpers ------------------------------- #
+    @staticmethod
+    async def _gather_bars(fetch_one, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run ``fetch_one(sym) -> bar | None`` for all symbols concurrently and keep
+        the bars that came back; per-symbol failures are dropped.
+        """
+        results = await asyncio.gather(*(fetch_one(sym) for sym in symbols), return_exceptions=True)
+        return {sym: bar for sym, bar in zip(symbols, results) if isinstance(bar, dict)}
+
     async def _rest_get_latest_bars_alpaca_stocks(self, symbols: List[str], *, timeout_sec: float) -> Dict[str, Dict[str, Any]]:
-        out: Dict[str, Dict[str, Any]] = {}
-        await self._ensure_session()
-        timeframe = self.bars_timeframe
-        base = self.data_rest_base  # .../v2/stocks
+        url_tmpl = f"{self._data_rest_base}/{{}}/bars?timeframe={self._bars_tf}&limit=1"  # .../v2/stocks
         sess = await self._ensure_session()
-        for sym in symbols:
-            try:
-                await self._rl_rest.acquire()
-                url = f"{base}/{sym}/bars?timeframe={timeframe}&limit=1"
-                async with sess.get(url, timeout=timeout_sec) as r:
-                    if r.status // 100 != 2:
-                        continue
-                    data = await r.json()
-                bars = isinstance(data, dict) and (data.get("bars") or data.get("bar"))
-                bar = (bars[-1] if isinstance(bars, list) and bars
-                       else bars if isinstance(bars, dict) else None)
-                if isinstance(bar, dict):
-                    out[sym] = self._norm_bar(bar, time.time() / 86400.0)
-            except Exception:
-                continue
-        return out
+        t_now = time.time() / 86400.0
+
+        async def _one(sym: str) -> Optional[Dict[str, Any]]:
+            await self._rl_rest.acquire()
+            url = url_tmpl.format(sym)
+            async with sess.get(url, timeout=_rest_timeout(timeout_sec)) as r:
+                self._note_rest_status(r.status)
+                if r.status // 100 != 2:
+                    return None
+                data = await r.json()
+            bars = isinstance(data, dict) and (data.get("bars") or data.get("bar"))
+            bar = (bars[-1] if isinstance(bars, list) and bars
+                   else bars if isinstance(bars, dict) else None)
+            return self._norm_bar(bar, t_now) if isinstance(bar, dict) else None
+
+        return await self._gather_bars(_one, symbols)
 
     async def _rest_get_latest_bars_alpaca_crypto(self, symbols: List[str], *, timeout_sec: float) -> Dict[str, Dict[str, Any]]:
         out: Dict[str, Dict[str, Any]] = {}
-        await self._ensure_session()
-        timeframe = self.bars_timeframe
-        base = self.data_rest_base  # .../v1beta3/crypto/us
+        if not symbols:
+            return out
+        base = self._data_rest_base  # .../v1beta3/crypto/us
         sess = await self._ensure_session()
-        for sym in symbols:
-            try:
-                await self._rl_rest.acquire()
-                url = f"{base}/bars?symbols={sym}&timeframe={timeframe}&limit=1"
-                async with sess.get(url, timeout=timeout_sec) as r:
-                    if r.status // 100 != 2:
-                        continue
-                    data = await r.json()
-                bars_by_sym = (isinstance(data, dict) and data.get("bars")) or {}
-                seq = (isinstance(bars_by_sym, dict) and bars_by_sym.get(sym)) or []
-                bar = seq[-1] if isinstance(seq, list) and seq else None
-                if isinstance(bar, dict):
-                    # normalize potential timestamp key variants
-                    b = {"o": bar.get("o"), "h": bar.get("h"), "l": bar.get("l"),
-                         "c": bar.get("c"), "v": bar.get("v"), "t": bar.get("t") or bar.get("timestamp")}
-                    out[sym] = self._norm_bar(b, time.time() / 86400.0)
-            except Exception:
-                continue
+        # latest/bars returns one bar per symbol for a whole symbol list in one call
+        # (on /bars, ``limit`` would cap the total across symbols, not per symbol)
+        try:
+            await self._rl_rest.acquire()
+            url = f"{base}/latest/bars?symbols={','.join(symbols)}"
+            async with sess.get(url, timeout=_rest_timeout(timeout_sec)) as r:
+                self._note_rest_status(r.status)
+                if r.status // 100 != 2:
+                    return out
+                data = await r.json()
+        except Exception:
+            return out
+        bars_by_sym = (isinstance(data, dict) and data.get("bars")) or {}
+        if not isinstance(bars_by_sym, dict):
+            return out
+        t_now = time.time() / 86400.0
+        for sym, bar in bars_by_sym.items():
+            if isinstance(bar, list):  # tolerate the /bars list-per-symbol shape
+                bar = bar[-1] if bar else None
+            if isinstance(bar, dict):
+                # normalize potential timestamp key variants
+                b = {"o": bar.get("o"), "h": bar.get("h"), "l": bar.get("l"),
+                     "c": bar.get("c"), "v": bar.get("v"), "t": bar.get("t") or bar.get("timestamp")}
+                try:
+                    out[sym] = self._norm_bar(b, t_now)
+                except (TypeError, ValueError):
+                    continue
         return out
 
     async def _rest_get_latest_bars_binance(self, symbols: List[str], *, timeout_sec: float) -> Dict[str, Dict[str, Any]]:
-        out: Dict[str, Dict[str, Any]] = {}
-        await self._ensure_session()
-        base = self.data_rest_base  # https://api.binance.com/api
+        # https://api.binance.com/api/v3/klines?symbol=...
+        url_tmpl = f"{self._data_rest_base}/v3/klines?symbol={{}}&interval={self._binance_interval}&limit=1"
         sess = await self._ensure_session()
-        # Map common tf to Binance intervals
-        tf = self.bars_timeframe.lower()
-        interval = {"1min": "1m", "1m": "1m", "5min": "5m", "5m": "5m"}.get(tf, "1m")
-        for sym in symbols:
-            try:
-                await self._rl_rest.acquire()
-                url = f"{base}/v3/klines?symbol={sym}&interval={interval}&limit=1"
-                async with sess.get(url, timeout=timeout_sec) as r:
-                    if r.status // 100 != 2:
-                        continue
-                    data = await r.json()
-                if isinstance(data, list) and data:
-                    k = data[-1]  # [ openTime, o, h, l, c, v, closeTime, ... ]
-                    bar = {"o": float(k[1]), "h": float(k[2]), "l": float(k[3]),
-                           "c": float(k[4]), "v": float(k[5]), "t": float(k[6]) / 86400_000.0}
-                    out[sym] = self._norm_bar(bar, time.time() / 86400.0)
-            except Exception:
-                continue
-        return out
+        t_now = time.time() / 86400.0
+
+        async def _one(sym: str) -> Optional[Dict[str, Any]]:
+            await self._rl_rest.acquire()
+            url = url_tmpl.format(sym)
+            async with sess.get(url, timeout=_rest_timeout(timeout_sec)) as r:
+                self._note_rest_status(r.status)
+                if r.status // 100 != 2:
+                    return None
+                data = await r.json()
+            if not (isinstance(data, list) and data):
+                return None
+            k = data[-1]  # [ openTime, o, h, l, c, v, closeTime, ... ]
+            bar = {"o": float(k[1]), "h": float(k[2]), "l": float(k[3]),
+                   "c": float(k[4]), "v": float(k[5]), "t": float(k[6]) / 86400_000.0}
+            return self._norm_bar(bar, t_now)
+
+        return await self._gather_bars(_one, symbols)
 
     async def _rest_get_latest_bars_generic(self, symbols: List[str], *, timeout_sec: float) -> Dict[str, Dict[str, Any]]:
-        out: Dict[str, Dict[str, Any]] = {}
-        await self._ensure_session()
-        timeframe = self.bars_timeframe
-        base = self.data_rest_base
+        url_tmpl = f"{self._data_rest_base}/{{}}/bars?timeframe={self._bars_tf}&limit=1"
         sess = await self._ensure_session()
-        for sym in symbols:
-            try:
-                await self._rl_rest.acquire()
-                url = f"{base}/{sym}/bars?timeframe={timeframe}&limit=1"
-                async with sess.get(url, timeout=timeout_sec) as r:
-                    if r.status // 100 != 2:
-                        continue
-                    data = await r.json()
-                bars = isinstance(data, dict) and (data.get("bars") or data.get("bar"))
-                bar = (bars[-1] if isinstance(bars, list) and bars
-                       else bars if isinstance(bars, dict) else None)
-                if isinstance(bar, dict):
-                    out[sym] = self._norm_bar(bar, time.time() / 86400.0)
-            except Exception:
-                continue
-        return out
+        t_now = time.time() / 86400.0
+
+        async def _one(sym: str) -> Optional[Dict[str, Any]]:
+            await self._rl_rest.acquire()
+            url = url_tmpl.format(sym)
+            async with sess.get(url, timeout=_rest_timeout(timeout_sec)) as r:
+                self._note_rest_status(r.status)
+                if r.status // 100 != 2:
+                    return None
+                data = await r.json()
+            bars = isinstance(data, dict) and (data.get("bars") or data.get("bar"))
+            bar = (bars[-1] if isinstance(bars, list) and bars
+                   else bars if isinstance(bars, dict) else None)
+            return self._norm_bar(bar, t_now) if isinstance(bar, dict) else None
+
+        return await self._gather_bars(_one, symbols)
 
     # --------------------- local-mode episode reset (subscriptions/cache) --------------------- #
     def reset_subscriptions(self, symbols: list[str]) -> None:
@@ -549,16 +785,16 @@ class TradingMarket:
         if self.freeze_subscriptions:
             return
         try:
-            symbols = list(dict.fromkeys(symbols or []))
-            old = list(self._subscribed)
+            new = frozenset(symbols if symbols is not None else ())
+            cur = self._subscribed
             # Unsubscribe symbols that are no longer used
-            rm = [s for s in old if s not in symbols]
+            rm = cur - new
             if rm:
-                self.unsubscribe(rm)
+                self.unsubscribe(list(rm))
             # Subscribe any new symbols
-            add = [s for s in symbols if s not in self._subscribed]
+            add = new - cur
             if add:
-                self.subscribe(add)
+                self.subscribe(list(add))
             # Reset previous NAV vectors used in paper/real (harmless in local)
             with self._cache_lock:
                 self._account_cache.pop("_nav_prev_vec", None)
@@ -569,15 +805,10 @@ class TradingMarket:
     # ------------------------------- snapshot helpers ------------------------------- #
     def _ensure_bars(self, symbols: np.ndarray, timeout_sec: float = 1.0) -> None:
         """Ensure WS subscription, wait for cache fill, and backfill zeros once."""
-        import numpy as np, time
 
         # Normalize symbols: ndarray -> list[str], preserve order, deduplicate
-        if isinstance(symbols, np.ndarray):
-            syms = symbols.tolist()
-        else:
-            syms = list(symbols)
-        syms = [str(s) for s in syms]
-        syms = list(dict.fromkeys(syms))
+        syms = [str(s) for s in _as_symbol_list(symbols)]
+        syms = _dedup_preserve(syms)
         if not syms:
             return
 
@@ -585,7 +816,8 @@ class TradingMarket:
 
         # Subscribe any missing symbols (when subscriptions are not frozen)
         if not self.freeze_subscriptions:
-            miss = [s for s in syms if s not in self._subscribed]
+            subscribed = self._subscribed
+            miss = [s for s in syms if s not in subscribed]
             if miss:
                 try:
                     self.subscribe(miss)
@@ -593,22 +825,23 @@ class TradingMarket:
                     pass
 
         # Wait briefly until the cache has entries for subscribed symbols
-        need = {s for s in syms if s in self._subscribed}
-        while time.time() < deadline and need:
-            with self._cache_lock:
-                have = {s for s in need if s in self._market_cache}
-            if have == need:
-                break
-            time.sleep(0.01)
+        subscribed = self._subscribed  # re-read: subscribe() swaps in a new set
+        need = [s for s in syms if s in subscribed]
+        if need:
+            # Woken by each cache write instead of polling
+            with self._cache_cv:
+                while not all(s in self._market_cache for s in need):
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self._cache_cv.wait(timeout=remaining)
 
         # If any closing price is zero, try a one-shot REST backfill
         zeros = []
-        with self._cache_lock:
-            for s in syms:
-                bar = self._market_cache.get(s) or {}
-                c = float(bar.get("c") or bar.get("price") or 0.0)
-                if c == 0.0:
-                    zeros.append(s)
+        cache = self._market_cache
+        for s in syms:
+            if _latest_price(cache.get(s)) == 0.0:
+                zeros.append(s)
         if zeros:
             try:
                 self._backfill_from_snapshot(zeros)
@@ -616,65 +849,50 @@ class TradingMarket:
                 pass
 
 
+    def _get_symbol_prices(self, symbols: List[str]) -> np.ndarray:
+        """Return the cached close for each symbol as a float64 array (0.0 when missing)."""
+        cache_get = self._market_cache.get  # current snapshot; no lock needed
+        return np.fromiter(
+            (_latest_price(cache_get(s)) for s in symbols),
+            dtype=np.float64,
+            count=len(symbols),
+        )
+
     # ------------------------------- public snapshots ------------------------------- #
     def get_cached_bars(self, symbols: np.ndarray) -> np.ndarray:
         """
         Return cached OHLCV data for each symbol as an (N, 6) float32 array
         ordered [o, h, l, c, v, t], preserving the original order and duplicates.
 
-        Strategy (thread-safe against the cache lock):
+        Strategy (reads the copy-on-write cache snapshot without locking):
         1) Read from cache and fill an (N,6) array.
         2) If any row has close==0.0 or cache-miss, backfill ONLY the needed unique symbols.
         3) Re-read from cache and return the fully aligned (N,6).
         """
-        import time
-        import numpy as np
 
         # EN: Normalize input to a Python list while preserving order & duplicates
-        if isinstance(symbols, np.ndarray):
-            syms = symbols.tolist()
-        else:
-            syms = list(symbols)
+        syms = _as_symbol_list(symbols)
 
         n = len(syms)
         t_now = float(time.time() / 86400.0)
         out = np.zeros((n, 6), dtype=np.float32)  # [o,h,l,c,v,t]
 
-        # EN: Helper to copy one bar dict -> row tuple with robust defaults
-        def _bar_to_row(bar: dict) -> tuple:
-            if not bar:
-                return (0.0, 0.0, 0.0, 0.0, 0.0, t_now)
-            o = float(bar.get("o", 0.0))
-            h = float(bar.get("h", 0.0))
-            l = float(bar.get("l", 0.0))
-            c = float(bar.get("c", bar.get("price", 0.0)) or 0.0)
-            v = float(bar.get("v", 0.0))
-            t = bar.get("t", t_now)
-            try:
-                t = float(t)
-            except Exception:
-                t = t_now
-            return (o, h, l, c, v, t)
+        # EN: Normalize every row from the current snapshot, then convert them in one bulk assignment
+        def _fill_from_cache() -> None:
+            cache_get = self._market_cache.get  # current snapshot; no lock needed
+            rows = [_norm_bar_tuple(cache_get(s) or _NO_BAR, t_now) for s in syms]
+            if rows:
+                out[:] = rows
 
         # EN: 1) Initial fill from cache
-        missing_or_zero = set()  # EN: collect symbols that need backfill
-        with self._cache_lock:
-            for i, s in enumerate(syms):
-                bar = dict(self._market_cache.get(s) or {})
-                row = _bar_to_row(bar)
-                out[i, :] = row
-                if row[3] == 0.0:  # close==0.0
-                    missing_or_zero.add(s)
+        _fill_from_cache()
+        # EN: collect symbols that need backfill (cache miss or close==0.0)
+        missing_or_zero = {syms[i] for i in np.flatnonzero(out[:, 3] == 0.0)}
 
         # EN: 2) If anything is missing/zero, backfill only the required unique symbols
         if missing_or_zero:
             # EN: keep original encounter order while deduping minimal set
-            unique_needed = []
-            seen = set()
-            for s in syms:
-                if s in missing_or_zero and s not in seen:
-                    unique_needed.append(s)
-                    seen.add(s)
+            unique_needed = _dedup_preserve(s for s in syms if s in missing_or_zero)
             try:
                 # EN: This populates the internal cache; network-safe in local/paper/real
                 self._backfill_from_snapshot(unique_needed)
@@ -683,18 +901,16 @@ class TradingMarket:
                 pass
 
             # EN: 3) Re-read from cache to rebuild the aligned array
-            with self._cache_lock:
-                for i, s in enumerate(syms):
-                    bar = dict(self._market_cache.get(s) or {})
-                    out[i, :] = _bar_to_row(bar)
+            _fill_from_cache()
 
         return out
 
 
     def get_market_features(self, symbols: np.ndarray, timeout_sec: float = 1.0) -> np.ndarray:
         """Return (N,6) array [o,h,l,c,v,t] for the requested symbols."""
-        self._ensure_bars(symbols, timeout_sec)
-        return self.get_cached_bars(symbols)
+        syms = _as_symbol_list(symbols)  # convert once for both passes
+        self._ensure_bars(syms, timeout_sec)
+        return self.get_cached_bars(syms)
 
     # ------------------------------- account snapshot ------------------------------- #
     def get_account_features(self, symbols: np.ndarray) -> np.ndarray:
@@ -703,26 +919,20 @@ class TradingMarket:
         Columns match TradingVecEnv.ACCOUNT_FEATURE_KEYS order:
         [position_qty, cash, avg_entry_price, unrealized_pnl, exposure, asset_nav]
         """
-        import numpy as np
-        # --- fetch account & positions (unchanged networking) ---
-        account, positions = self._submit(self._get_account_and_positions())
+        # --- fetch account & positions (reused within cfg.account_ttl_sec) ---
+        account, positions = self._account_and_positions()
 
         # --- index positions by symbol for quick lookup ---
-        pos_by_sym = {}
+        pos_by_sym: Dict[str, Tuple[float, float]] = {}
         for p in positions or []:
             s = str(p.get("symbol") or "")
             if not s:
                 continue
             qty = float(p.get("qty") or p.get("quantity") or 0.0)
             avg = float(p.get("avg_entry_price") or p.get("avg_price") or 0.0)
-            pos_by_sym[s] = {"qty": qty, "avg": avg}
+            pos_by_sym[s] = (qty, avg)
 
-        # --- latest prices from market cache (aligned to input symbols) ---
-        syms = symbols.tolist() if isinstance(symbols, np.ndarray) else list(symbols)
-        with self._cache_lock:
-            px_by_sym = {s: float((self._market_cache.get(s, {}) or {}).get("c")
-                                or (self._market_cache.get(s, {}) or {}).get("price")
-                                or 0.0) for s in syms}
+        syms = _as_symbol_list(symbols)
 
         # --- distribute cash equally per slot (same behavior as before) ---
         n = max(1, len(syms))
@@ -730,27 +940,51 @@ class TradingMarket:
 
         # --- build (N,6) ndarray in the canonical feature order ---
         out = np.zeros((n, 6), dtype=np.float32)
-        for i, s in enumerate(syms):
-            qty = float(pos_by_sym.get(s, {}).get("qty", 0.0))
-            avg = float(pos_by_sym.get(s, {}).get("avg", 0.0))
-            px  = float(px_by_sym.get(s, 0.0))
-            exposure = qty * px
-            unreal   = (px - avg) * qty
-            nav_i    = cash_share + exposure
-
-            # [position_qty, cash, avg_entry_price, unrealized_pnl, exposure, asset_nav]
-            out[i, 0] = qty
-            out[i, 1] = cash_share
-            out[i, 2] = avg
-            out[i, 3] = unreal
-            out[i, 4] = exposure
-            out[i, 5] = nav_i
+        m = len(syms)
+        if m == 0:
+            return out
+        # One probe per symbol yields both fields; columns are views of the (m,2) block
+        pos = np.array([pos_by_sym.get(s, _NO_POSITION) for s in syms], dtype=np.float32).reshape(m, 2)
+        qty = pos[:, 0]
+        avg = pos[:, 1]
+        # Latest prices straight from the market cache snapshot, aligned to syms
+        cache_get = self._market_cache.get
+        px = np.fromiter((_latest_price(cache_get(s)) for s in syms), dtype=np.float32, count=m)
+
+        # [position_qty, cash, avg_entry_price, unrealized_pnl, exposure, asset_nav]
+        # float32 throughout, written straight into the output columns; exposure is
+        # computed once and reused for the NAV column
+        out[:, 0] = qty
+        out[:, 1] = cash_share
+        out[:, 2] = avg
+        unreal = np.subtract(px, avg, out=out[:, 3])
+        unreal *= qty
+        exposure = np.multiply(qty, px, out=out[:, 4])
+        np.add(exposure, np.float32(cash_share), out=out[:, 5])
         return out
 
+    def _account_and_positions(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Return the (account, positions) snapshot, refetching once it is older than
+        the TTL or order activity has invalidated it since it was fetched.
+        """
+        gen, ts_ns, snapshot = self._account_entry
+        now = time.monotonic_ns()
+        if gen == self._account_gen and now - ts_ns < self._account_ttl_ns:
+            return snapshot
+        # Capture generation and time before the fetch: an invalidation during it
+        # leaves the stored entry stale, and the age counts from the request start
+        gen = self._account_gen
+        snapshot = self._submit(self._get_account_and_positions())
+        self._account_entry = (gen, now, snapshot)
+        return snapshot
+
     async def _get_account_and_positions(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
-        # Mirrors original logic with small helper usage
-        status_a, account = await self._rest_get_json(self.rest_base, "/account", timeout=5)
-        status_p, positions = await self._rest_get_json(self.rest_base, "/positions", timeout=5)
+        # The two snapshots are independent: overlap them to pay one round trip, not two
+        (status_a, account), (status_p, positions) = await asyncio.gather(
+            self._rest_get_json(self.rest_base, "/account", timeout=5),
+            self._rest_get_json(self.rest_base, "/positions", timeout=5),
+        )
         account = account or {}
         positions = positions or []
         with self._cache_lock:
@@ -759,90 +993,112 @@ class TradingMarket:
 
     # ------------------------------- orders ------------------------------- #
     def submit_orders(self, symbols: np.ndarray, sides: np.ndarray, qtys: np.ndarray, trade_mode: str) -> np.ndarray:
+        """
+        Submit one order per lane. ``sides`` holds either side strings
+        (``"hold"``/``"buy"``/``"sell"``) or integer action codes (0/1/2);
+        codes are used as-is for local fills and mapped to side names only
+        when real orders are sent.
+
+        Local mode returns an :class:`OrderResultSoA` aligned with ``symbols``
+        (skipped lanes hold with price 0.0); paper/real return one result
+        dict per lane.
+        """
         assert len(symbols) == len(sides) == len(qtys), "length mismatch"
         mode = trade_mode or self.trade_mode
-
-        results: List[Optional[dict]] = [None] * len(symbols)
+        side_codes = isinstance(sides, np.ndarray) and sides.dtype.kind in "iu"
+        if side_codes and sides.size and (sides.min() < 0 or sides.max() > 2):
+            # Any code other than 1 (buy) / 2 (sell) means hold
+            sides = np.where((sides >= 0) & (sides <= 2), sides, 0)
+        if side_codes and mode != "local":
+            sides = _SIDE_NAMES[sides]
+            side_codes = False
+
+        # First lane of each distinct symbol, found by np.unique in C and put back in lane order
+        n = len(symbols)
+        sym_arr = np.asarray(symbols, dtype=object)
+        uniq_vals, first = np.unique(sym_arr, return_index=True)
+        first.sort()
 
         # Auto-subscribe only in local mode
-        miss = [s for s in symbols if s not in self._subscribed]
+        miss = [s for s in uniq_vals if s not in self._subscribed]
         if miss and mode == "local":
             try:
                 self.subscribe(miss)
             except Exception:
                 pass
 
-        uniq_syms: List[str] = []
-        uniq_sides: List[str] = []
-        uniq_qtys: List[int] = []
-        first_idx: Dict[str, int] = {}
-        for i, (s, side, qty) in enumerate(zip(symbols, sides, qtys)):
-            if s not in self._subscribed:
-                results[i] = {"symbol": s, "skipped": True, "reason": "not_subscribed"}
-                continue
-            if s in first_idx:
-                results[i] = {"symbol": s, "skipped": True, "reason": "duplicate_lane"}
-                continue
-            first_idx[s] = i
-            uniq_syms.append(s)
-            uniq_sides.append(side)
-            uniq_qtys.append(qty)
+        subscribed = self._subscribed  # read after subscribe(), which swaps in a new set
+        lanes = first[np.fromiter((sym_arr[i] in subscribed for i in first), dtype=bool, count=len(first))]
+        uniq_syms: List[str] = sym_arr[lanes].tolist()
 
         if uniq_syms:
-            _ = self.get_market_features(uniq_syms, timeout_sec=0.5)
+            # Warm the cache only; the (N,6) bar array is built later by build_observation
+            self._ensure_bars(uniq_syms, timeout_sec=0.5)
 
         if mode == "local":
-            side_to_action = {"hold": 0, "buy": 1, "sell": 2}
-            now = int(time.time() * 1e6)
-            with self._cache_lock:
-                for j, s in enumerate(uniq_syms):
-                    price = float(self._market_cache.get(s, {}).get("c") or self._market_cache.get(s, {}).get("price") or 0.0)
-                    results[first_idx[s]] = {
-                        "order_id": f"local-{s}-{now+j}",
-                        "symbol": s,
-                        "status": "filled",
-                        "filled_avg_price": price,
-                        "action": side_to_action.get(uniq_sides[j], 0),
-                    }
-        else:
-            outs: List[dict] = []
+            fills = OrderResultSoA(np.zeros(n, dtype=np.float32), np.zeros(n, dtype=np.int8))
             if uniq_syms:
-                try:
-                    outs = self._submit(self._submit_orders_async(uniq_syms, uniq_sides, uniq_qtys))
-                except Exception as e:
-                    outs = [{"error": str(e)} for _ in uniq_syms]
-            for j, s in enumerate(uniq_syms):
-                res = outs[j] if j < len(outs) else {}
-                if not isinstance(res, dict):
-                    res = {}
-                if res.get("error"):
-                    results[first_idx[s]] = {"symbol": s, "skipped": True, "reason": "error", "error": str(res.get("error"))}
+                fills.filled_avg_price[lanes] = self._get_symbol_prices(uniq_syms)
+                if side_codes:
+                    fills.action[lanes] = sides[lanes]
                 else:
-                    res["symbol"] = s
-                    results[first_idx[s]] = res
+                    side_action = _SIDE_ACTIONS.get
+                    fills.action[lanes] = [side_action(sides[i], 0) for i in lanes.tolist()]
+            return fills
+
+        # Lanes not chosen above are either unsubscribed or repeat an earlier lane's symbol
+        results: List[Optional[dict]] = [None] * n
+        skipped = np.ones(n, dtype=bool)
+        skipped[lanes] = False
+        for i in np.flatnonzero(skipped).tolist():
+            s = sym_arr[i]
+            reason = "duplicate_lane" if s in subscribed else "not_subscribed"
+            d = _SKIPPED[reason].copy()
+            d["symbol"] = s
+            results[i] = d
+        first_idx: Dict[str, int] = dict(zip(uniq_syms, lanes.tolist()))
+        uniq_sides: List[str] = [sides[i] for i in first_idx.values()]
+        uniq_qtys: List[int] = [qtys[i] for i in first_idx.values()]
 
-        for i, r in enumerate(results):
-            if r is None:
-                results[i] = {"symbol": symbols[i], "skipped": True, "reason": "no_order"}
+        outs: List[dict] = []
+        if uniq_syms:
+            try:
+                outs = self._submit(self._submit_orders_async(uniq_syms, uniq_sides, uniq_qtys))
+            except Exception as e:
+                outs = [{"error": str(e)} for _ in uniq_syms]
+            self._account_gen += 1  # new orders: don't reuse the pre-order account snapshot
+        for j, s in enumerate(uniq_syms):
+            res = outs[j] if j < len(outs) else {}
+            if not isinstance(res, dict):
+                res = {}
+            if res.get("error"):
+                d = _SKIPPED["error"].copy()
+                d["symbol"] = s
+                d["error"] = str(res.get("error"))
+                results[first_idx[s]] = d
+            else:
+                res["symbol"] = s
+                results[first_idx[s]] = res
 
         return results
 
     async def _submit_orders_async(self, symbols: List[str], sides: List[str], qtys: List[int]) -> List[dict]:
-        outs: List[dict] = []
+        # Orders are independent: post them concurrently and let the REST token bucket
+        # (and the connector's per-host limit) pace them
         url_base = self.rest_base
-        for sym, side, qty in zip(symbols, sides, qtys):
-            try:
-                await self._rl_rest.acquire()
-                payload = {"symbol": sym, "qty": int(qty), "side": side, "type": "market", "time_in_force": "day"}
-                status, data = await self._rest_post_json(url_base, "/orders", payload, timeout=5)
-                if status and status // 100 == 2 and isinstance(data, dict):
-                    outs.append({"order_id": str(data.get("id", f"order-{int(time.time()*1e6)}"))})
-                else:
-                    tag = "err" if status else "exc"
-                    outs.append({"order_id": f"{tag}-{sym}-{int(time.time()*1e6)}"})
-            except Exception as e:
-                outs.append({"error": str(e)})
-        return outs
+        results = await asyncio.gather(
+            *(self._submit_one_order(url_base, sym, side, qty) for sym, side, qty in zip(symbols, sides, qtys)),
+            return_exceptions=True,
+        )
+        return [{"error": str(r)} if isinstance(r, BaseException) else r for r in results]
+
+    async def _submit_one_order(self, url_base: str, sym: str, side: str, qty: int) -> dict:
+        payload = {"symbol": sym, "qty": int(qty), "side": side, "type": "market", "time_in_force": "day"}
+        status, data = await self._rest_post_json(url_base, "/orders", payload, timeout=5)  # acquires the bucket
+        if status and status // 100 == 2 and isinstance(data, dict):
+            return {"order_id": str(data.get("id", f"order-{int(time.time()*1e6)}"))}
+        tag = "err" if status else "exc"
+        return {"order_id": f"{tag}-{sym}-{int(time.time()*1e6)}"}
 
     def cancel_orders(self, order_ids: List[str]) -> None:
         self._submit(self._cancel_orders_async(order_ids))
@@ -888,28 +1144,27 @@ class TradingMarket:
         if not active_syms:
             return reward, truncated, terminated
 
-        account, positions = self._submit(self._get_account_and_positions())
+        account, positions = self._account_and_positions()
         cash_total = float(account.get("cash", 0.0) or 0.0)
         cash_share = cash_total / float(len(active_syms)) if active_syms else 0.0
         qty_map = {
             str(p.get("symbol") or ""): float(p.get("qty") or p.get("quantity") or 0.0)
             for p in (positions or [])
         }
+        cache = self._market_cache
         with self._cache_lock:
-            prices = {
-                s: float((self._market_cache.get(s, {}) or {}).get("c")
-                         or (self._market_cache.get(s, {}) or {}).get("price")
-                         or 0.0)
-                for s in active_syms
-            }
-            prev_map = dict(self._account_cache.get("_nav_prev_by_sym") or {})
-
-        nav_map: Dict[str, float] = {}
-        for s in active_syms:
-            nav = cash_share + qty_map.get(s, 0.0) * prices.get(s, 0.0)
-            nav_map[s] = nav
-            prev = float(prev_map.get(s, 0.0) or 0.0)
-            reward[first_idx[s]] = float(nav - prev)
+            # Replaced wholesale by each step, never mutated: the reference is a stable snapshot
+            prev_map = self._account_cache.get("_nav_prev_by_sym") or {}
+
+        # Per-active-symbol arrays → one NAV pass and one scatter into the lane rewards
+        k = len(active_syms)
+        idxs = np.fromiter((first_idx[s] for s in active_syms), dtype=np.intp, count=k)
+        qtys = np.fromiter((qty_map.get(s, 0.0) for s in active_syms), dtype=np.float64, count=k)
+        pxs = np.fromiter((_latest_price(cache.get(s)) for s in active_syms), dtype=np.float64, count=k)
+        prevs = np.fromiter((float(prev_map.get(s, 0.0) or 0.0) for s in active_syms), dtype=np.float64, count=k)
+        navs = cash_share + qtys * pxs
+        reward[idxs] = navs - prevs
+        nav_map: Dict[str, float] = dict(zip(active_syms, navs.tolist()))
 
         with self._cache_lock:
             self._account_cache["_nav_prev_by_sym"] = nav_map
@@ -923,7 +1178,6 @@ class TradingMarket:
         pairs. Supports plain dictionaries, lists, and envelopes containing
         ``bars`` or ``data`` arrays.
         """
-        import time
         items = []
         if isinstance(msg, list):
             items = [x for x in msg if isinstance(x, dict)]
@@ -943,12 +1197,14 @@ class TradingMarket:
             sym = it.get("S") or it.get("symbol")
             if not sym:
                 continue
-            o = float(it.get("o", 0.0))
-            h = float(it.get("h", 0.0))
-            l = float(it.get("l", 0.0))
-            c = float(it.get("c", 0.0) or it.get("price", 0.0))
-            v = float(it.get("v", 0.0))
-            t = it.get("t")
+            try:
+                # Full bars (the usual case): one C-level lookup for all six fields
+                o, h, l, c, v, t = _BAR_GETTER(it)
+            except KeyError:
+                o, h, l, v = it.get("o", 0.0), it.get("h", 0.0), it.get("l", 0.0), it.get("v", 0.0)
+                c, t = it.get("c", 0.0), it.get("t")
+            o, h, l, v = float(o), float(h), float(l), float(v)
+            c = float(c or it.get("price", 0.0))
             if not isinstance(t, (int, float)):
                 t = now_fd
             out.append((sym, {"o": o, "h": h, "l": l, "c": c, "v": v, "t": t}))
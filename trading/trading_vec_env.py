@@ -4,6 +4,19 @@ import numpy as np
 import gymnasium as gym
 from .trading_market import TradingMarket
 from .asset_utils import NUM_COUNTRIES, NUM_EXCHANGES, NUM_ASSET_TYPES, NUM_LOCAL_SYMBOLS
+from ._jit import HAVE_NUMBA, njit
+
+
+@njit(cache=True, fastmath=True)
+def _time_features_kernel(raw_time, periods, two_pi_over_periods, out):
+    """Fill ``out[i, k] = (sin, cos)`` of ``raw_time[i]``'s phase in period ``k``, in one pass."""
+    for i in range(raw_time.shape[0]):
+        t = raw_time[i]
+        for k in range(periods.shape[0]):
+            angle = (t % periods[k]) * two_pi_over_periods[k]
+            out[i, k, 0] = np.sin(angle)
+            out[i, k, 1] = np.cos(angle)
+
 
 class TradingVecEnv(gym.vector.VectorEnv):
 
@@ -18,17 +31,23 @@ class TradingVecEnv(gym.vector.VectorEnv):
     - ``"paper"``: fully simulated; no order submission
     """
 
+    # Periods (in days) of the cyclical time encodings, in time_features order
+    TIME_PERIODS = np.array([1.0, 7.0, 12.0, 4.0, 365.0], dtype=np.float32)
+    _TWO_PI_OVER_PERIODS = (2 * np.pi / TIME_PERIODS).astype(np.float32)
+
     def __init__(
         self,
         num_envs: int,
         *,
         alpaca_market: TradingMarket,                 # Shared TradingMarket or LocalAccount client
+        flat_obs: bool = False,                       # Pack observations into one (N,25) float32 array
         **kwargs,
     ) -> None:
         super().__init__()
         self.num_envs = int(num_envs)
         self.alpaca_market = alpaca_market
         self.trade_mode = alpaca_market.trade_mode  # "local" | "paper" | "real"
+        self.flat_obs = bool(flat_obs)
 
         # Symbols are expected to be provided externally; otherwise use the first N
         # from the client's initial subscription list.
@@ -40,7 +59,9 @@ class TradingVecEnv(gym.vector.VectorEnv):
             else:
                 reps = (self.num_envs + len(self.init_symbols) - 1) // len(self.init_symbols)
                 symbols = (self.init_symbols * reps)[: self.num_envs]
-        self.symbols = np.array(symbols, dtype=object)
+        # Plain list of str: the market client takes lists as-is, with no per-call
+        # ndarray -> list conversion
+        self.symbols: list[str] = symbols
         
         self.country_id  = alpaca_market.country_id
         self.exchange_id = alpaca_market.exchange_id
@@ -68,60 +89,111 @@ class TradingVecEnv(gym.vector.VectorEnv):
         
         # Gym spaces
         n = self.num_envs
-        self.observation_space = gym.spaces.Dict({
-            "asset_id": gym.spaces.MultiDiscrete([NUM_COUNTRIES, NUM_EXCHANGES, NUM_ASSET_TYPES, NUM_LOCAL_SYMBOLS]),
-            "market_features": gym.spaces.Box(low=-np.inf, high=np.inf, shape=(n, len(self.MARKET_FEATURE_KEYS)), dtype=np.float32),
-            "account_features": gym.spaces.Box(low=-np.inf, high=np.inf, shape=(n, len(self.ACCOUNT_FEATURE_KEYS)), dtype=np.float32),
-            "time_features": gym.spaces.Box(low=-1.0, high=1.0, shape=(n, 10), dtype=np.float32),
-        })
+        if self.flat_obs:
+            # Columns: asset_id(4) | market(5) | account(6) | time(10)
+            self.observation_space = gym.spaces.Box(low=-np.inf, high=np.inf, shape=(n, 25), dtype=np.float32)
+        else:
+            self.observation_space = gym.spaces.Dict({
+                "asset_id": gym.spaces.MultiDiscrete([NUM_COUNTRIES, NUM_EXCHANGES, NUM_ASSET_TYPES, NUM_LOCAL_SYMBOLS]),
+                "market_features": gym.spaces.Box(low=-np.inf, high=np.inf, shape=(n, len(self.MARKET_FEATURE_KEYS)), dtype=np.float32),
+                "account_features": gym.spaces.Box(low=-np.inf, high=np.inf, shape=(n, len(self.ACCOUNT_FEATURE_KEYS)), dtype=np.float32),
+                "time_features": gym.spaces.Box(low=-1.0, high=1.0, shape=(n, 10), dtype=np.float32),
+            })
         
         # Actions: per environment slot {0: hold, 1: buy, 2: sell}
         self.action_space = gym.spaces.MultiDiscrete([3] * self.num_envs)
 
         # Runtime state
         self.step_count = 0
+
+        # Per-lane order quantity is always one share; reused read-only every step
+        self._qtys_ones = np.ones(n, dtype=np.int64)
+        self._qtys_ones.setflags(write=False)
+
+        # asset_id rows are invariant for the env's lifetime: build once, share read-only
+        self._asset_ids = np.stack([
+            np.full(n, self.country_id,  dtype=np.int64),
+            np.full(n, self.exchange_id, dtype=np.int64),
+            np.full(n, self.asset_type,  dtype=np.int64),
+            np.arange(1, n + 1, dtype=np.int64),
+        ], axis=-1)
+        self._asset_ids.setflags(write=False)
+
+        # Reused (N, periods, [sin, cos]) output block for _build_time_features
+        self._time_feats_buf = np.empty((n, len(self.TIME_PERIODS), 2), dtype=np.float32)
+        self._time_key: bytes | None = None  # raw_time bytes the buffer was computed from
+        self._time_angles_buf = np.empty((n, len(self.TIME_PERIODS)), dtype=np.float32)
+        if HAVE_NUMBA:  # compile up front so the first step pays no JIT latency
+            _time_features_kernel(np.zeros(0, dtype=np.float32), self.TIME_PERIODS,
+                                  self._TWO_PI_OVER_PERIODS, self._time_feats_buf[:0])
+
+        # Persistent observation dict; every build overwrites these arrays in place
+        self._obs_buf = {
+            "asset_id": self._asset_ids,
+            "market_features": np.zeros((n, len(self.MARKET_FEATURE_KEYS)), dtype=np.float32),
+            "account_features": np.zeros((n, len(self.ACCOUNT_FEATURE_KEYS)), dtype=np.float32),
+            "time_features": self._time_feats_buf.reshape(n, -1),
+        }
+
+        # Flat (N,25) observation; the asset_id columns never change, so fill them once
+        if self.flat_obs:
+            self._flat_obs = np.empty((n, 25), dtype=np.float32)
+            self._flat_obs[:, 0:4] = self._asset_ids
             
-    def _build_time_features(self, market_features, symbols):
+    def _build_time_features(self, market_features):
         """
         Use time column (col=5) from market_features ndarray.
         """
-        import numpy as np
         raw_time = np.asarray(market_features)[:, 5].astype(np.float32)  # fractional days
-        feats = np.stack([
-            np.sin(2*np.pi*(raw_time % 1)   / 1.0),  np.cos(2*np.pi*(raw_time % 1)   / 1.0),
-            np.sin(2*np.pi*(raw_time % 7)   / 7.0),  np.cos(2*np.pi*(raw_time % 7)   / 7.0),
-            np.sin(2*np.pi*(raw_time % 12) / 12.0),  np.cos(2*np.pi*(raw_time % 12) / 12.0),
-            np.sin(2*np.pi*(raw_time % 4)   / 4.0),  np.cos(2*np.pi*(raw_time % 4)   / 4.0),
-            np.sin(2*np.pi*(raw_time % 365)/365.0),  np.cos(2*np.pi*(raw_time % 365)/365.0),
-        ], axis=-1).astype(np.float32)
-        return feats
+        periods = self.TIME_PERIODS
+
+        feats = self._time_feats_buf
+        if feats.shape[0] == raw_time.shape[0]:
+            # Bars often carry the same timestamps between steps; reuse the last block then
+            key = raw_time.tobytes()
+            if key == self._time_key:
+                return feats.reshape(feats.shape[0], -1)
+            self._time_key = key
+            if HAVE_NUMBA:
+                _time_features_kernel(raw_time, periods, self._TWO_PI_OVER_PERIODS, feats)
+                return feats.reshape(feats.shape[0], -1)
+            angles = self._time_angles_buf
+        else:
+            feats = np.empty((raw_time.shape[0], len(periods), 2), dtype=np.float32)
+            angles = np.empty((raw_time.shape[0], len(periods)), dtype=np.float32)
+
+        # One (N,5) angle block, computed in place → one sin and one cos call,
+        # interleaved per period
+        np.remainder(raw_time[:, None], periods, out=angles)
+        angles *= self._TWO_PI_OVER_PERIODS
+        np.sin(angles, out=feats[:, :, 0])
+        np.cos(angles, out=feats[:, :, 1])
+        return feats.reshape(feats.shape[0], -1)
 
     def _build_observation_features(self, market_features, account_features):
         """
         Both inputs are ndarray:
         market_features: (N,5) or (N,6) [o,h,l,c,v,(t)]
         account_features: (N,6) per ACCOUNT_FEATURE_KEYS
+
+        Returns the env's persistent observation dict (or the (N,25) array when
+        ``flat_obs`` is set), overwritten in place on every call; callers that
+        keep an observation across steps must copy it.
         """
-        n = len(self.symbols)
-        asset_ids = np.stack([
-            np.full(n, self.country_id,  dtype=np.int64),
-            np.full(n, self.exchange_id, dtype=np.int64),
-            np.full(n, self.asset_type,  dtype=np.int64),
-            np.arange(n, dtype=np.int64) + 1,
-        ], axis=-1)
+        if self.flat_obs:
+            flat = self._flat_obs
+            flat[:, 4:9] = market_features[:, :5]
+            flat[:, 9:15] = account_features
+            flat[:, 15:25] = self._build_time_features(market_features)
+            return flat
 
+        obs = self._obs_buf
         # Drop time for market_features box if you keep obs space at 5-cols; 
         # or keep 5-cols in obs and pass time via time_features only.
-        market_feats = np.asarray(market_features[:, :5], dtype=np.float32)
-        account_feats = np.asarray(account_features, dtype=np.float32)
-        time_feats = self._build_time_features(market_features, self.symbols)
-
-        return {
-            "asset_id": asset_ids,
-            "market_features": market_feats,
-            "account_features": account_feats,
-            "time_features": time_feats,
-        }
+        np.copyto(obs["market_features"], market_features[:, :5])
+        np.copyto(obs["account_features"], account_features)
+        obs["time_features"] = self._build_time_features(market_features)
+        return obs
 
     def get_account_features(self, symbols: np.ndarray) -> np.ndarray:
         """
@@ -152,7 +224,7 @@ class TradingVecEnv(gym.vector.VectorEnv):
         # Local-mode episode reset hooks
         if self.trade_mode == "local":
             # 1) re-randomize account state for current slot symbols
-            self.symbols = self.local_account.reset_account(self.init_symbols)
+            self.symbols = self.local_account.reset_account(self.init_symbols).tolist()
             # 2) refresh market subscriptions (best-effort)
             self.alpaca_market.reset_subscriptions(self.symbols)
                         
@@ -164,12 +236,11 @@ class TradingVecEnv(gym.vector.VectorEnv):
         
     def step(self, action: np.ndarray):
         self.step_count += 1
-        # Vectorized side mapping as ndarray
-        sides = np.where(action == 1, "buy", np.where(action == 2, "sell", "hold"))
-        qtys  = np.ones(self.num_envs, dtype=np.int64)  # vector of ones
-
+        # Action codes {0,1,2} travel as int8 end to end; submit_orders maps them
+        # to side names only when it has to place real orders
+        action = np.asarray(action, dtype=np.int8)
         order_results = self.alpaca_market.submit_orders(
-            self.symbols, sides, qtys, self.trade_mode
+            self.symbols, action, self._qtys_ones, self.trade_mode
         )
 
         # Reward and done signals (per-slot)
@@ -178,11 +249,14 @@ class TradingVecEnv(gym.vector.VectorEnv):
         # Build the next observation AFTER partial resets
         observation = self.build_observation()
 
-        # Optional: sanitize obs to avoid NaN/Inf issues during training
-        observation = {
-            k: (np.nan_to_num(v, nan=0.0, posinf=0.0, neginf=0.0) if hasattr(v, "dtype") else v)
-            for k, v in observation.items()
-        }
+        # Optional: sanitize obs to avoid NaN/Inf issues during training. The buffers are
+        # the env's own, so clean them in place; asset_id is constant and always finite
+        if self.flat_obs:
+            np.nan_to_num(observation[:, 4:], copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+        else:
+            for k, v in observation.items():
+                if k != "asset_id" and hasattr(v, "dtype"):
+                    np.nan_to_num(v, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
         info = {}
         
         # --- Vector auto-reset semantics (local only) ---
@@ -190,10 +264,12 @@ class TradingVecEnv(gym.vector.VectorEnv):
             dones = truncated | terminated
             if np.any(dones):
                 done_indices = np.flatnonzero(dones)
-                self.symbols[done_indices] = self.local_account.reset_account(self.init_symbols, indices=done_indices)
+                new_symbols = self.local_account.reset_account(self.init_symbols, indices=done_indices).tolist()
+                for i, s in zip(done_indices.tolist(), new_symbols):
+                    self.symbols[i] = s
                 # Best-effort reconcile (un)subscriptions to the new overall set
                 self.alpaca_market.reset_subscriptions(self.symbols)  # existing helper:contentReference[oaicite:1]{index=1}
-                done_market_features = self.alpaca_market.get_market_features(self.symbols[done_indices])
+                done_market_features = self.alpaca_market.get_market_features(new_symbols)
                 self.local_account.update_account(done_market_features, indices=done_indices)
 
         return observation, reward, terminated, truncated, info